@@ -0,0 +1,242 @@
+"""
+Headless self-play benchmark for Tic Tac Toe engines
+"""
+
+import itertools
+import sys
+import time
+from random import randrange
+
+import tictactoe as ttt
+
+GAMES = 10
+
+# Plain minimax and parallel minimax take about a second per move,
+# so they only run when named on the command line
+DEFAULT_ENGINES = ["memoized", "alphabeta", "table"]
+
+
+class Engine():
+    """
+    Tic Tac Toe engine that chooses moves with `search`, ttt.minimax by
+    default, and keeps track of the work done while choosing them.
+
+    If `instrumented` is true, ttt.max_value and ttt.min_value are
+    replaced while searching by wrappers that count the boards they are
+    called on as nodes. If `cache` is a dict, the wrappers first look
+    boards up in it, and store the values they compute there. Engines
+    that are not instrumented have `nodes` set to None.
+    """
+
+    def __init__(self, name, search=ttt.minimax, cache=None, instrumented=True):
+        self.name = name
+        self.search = search
+        self.cache = cache
+        self.instrumented = instrumented
+        self.nodes = 0 if instrumented else None
+        self.lookups = 0
+        self.hits = 0
+        self.moves = 0
+        self.seconds = 0
+
+    def instrument(self, function):
+        """
+        Returns a wrapper of ttt.max_value or ttt.min_value that counts
+        nodes and reads and writes the cache.
+        """
+        def value(board):
+            if self.cache is None:
+                self.nodes += 1
+                return function(board)
+            key = ttt.board_key(board)
+            self.lookups += 1
+            if key in self.cache:
+                self.hits += 1
+                return self.cache[key]
+            self.nodes += 1
+            v = self.cache[key] = function(board)
+            return v
+        return value
+
+    def move(self, board):
+        """
+        Returns the action chosen by the engine's search on the board.
+        """
+        max_value, min_value = ttt.max_value, ttt.min_value
+        if self.instrumented:
+            ttt.max_value = self.instrument(max_value)
+            ttt.min_value = self.instrument(min_value)
+        start = time.perf_counter()
+        try:
+            action = self.search(board)
+        finally:
+            self.seconds += time.perf_counter() - start
+            ttt.max_value, ttt.min_value = max_value, min_value
+        self.moves += 1
+        return action
+
+    def hit_rate(self):
+        """
+        Returns the fraction of cache lookups that were hits,
+        or None if the engine has no cache.
+        """
+        if self.lookups == 0:
+            return None
+        return self.hits / self.lookups
+
+
+class AlphaBeta(Engine):
+    """
+    Minimax with alpha-beta pruning, which tictactoe.py does not have,
+    for comparison with the engines that run ttt.minimax.
+    """
+
+    def __init__(self):
+        super().__init__("alphabeta", self.alphabeta, instrumented=False)
+        self.nodes = 0
+
+    def alphabeta(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        choosing randomly among equally good actions like ttt.minimax.
+        """
+        maximizing = ttt.player(board) == ttt.X
+        v = None
+        for action in ttt.actions(board):
+            val = self.value(ttt.result(board, action))
+            if v is None or (maximizing and val > v) or (not maximizing and val < v):
+                options = [action]
+                v = val
+            elif val == v:
+                options.append(action)
+        return options[randrange(len(options))]
+
+    def value(self, board, alpha=-99, beta=99):
+        """
+        Returns the minimax value of the board, or a bound on it
+        outside the window from `alpha` to `beta`.
+        """
+        self.nodes += 1
+        if ttt.terminal(board):
+            return ttt.utility(board)
+        if ttt.player(board) == ttt.X:
+            v = -99
+            for action in ttt.actions(board):
+                v = max(v, self.value(ttt.result(board, action), alpha, beta))
+                alpha = max(alpha, v)
+                if alpha >= beta:
+                    break
+        else:
+            v = 99
+            for action in ttt.actions(board):
+                v = min(v, self.value(ttt.result(board, action), alpha, beta))
+                beta = min(beta, v)
+                if alpha >= beta:
+                    break
+        return v
+
+
+# Nodes searched by parallel_minimax are counted in the pool's worker
+# processes, so they are not reported
+ENGINES = {
+    "minimax": lambda: Engine("minimax"),
+    "memoized": lambda: Engine("memoized", cache={}),
+    "alphabeta": AlphaBeta,
+    "table": lambda: Engine("table", cache=solve(ttt.initial_state())),
+    "parallel": lambda: Engine("parallel", ttt.parallel_minimax, instrumented=False),
+}
+
+
+def solve(board, table=None):
+    """
+    Returns a dict mapping every board reachable from `board`
+    to its minimax value.
+    """
+    if table is None:
+        table = {}
+    key = ttt.board_key(board)
+    if key in table:
+        return table
+    if ttt.terminal(board):
+        table[key] = ttt.utility(board)
+        return table
+    values = []
+    for action in ttt.actions(board):
+        child = ttt.result(board, action)
+        solve(child, table)
+        values.append(table[ttt.board_key(child)])
+    table[key] = max(values) if ttt.player(board) == ttt.X else min(values)
+    return table
+
+
+def play(engine_x, engine_o, reference):
+    """
+    Plays one game between two engines and returns the winner and
+    the number of moves that changed the value of the game, which
+    an optimal move never does.
+    """
+    board = ttt.initial_state()
+    disagreements = 0
+    while not ttt.terminal(board):
+        engine = engine_x if ttt.player(board) == ttt.X else engine_o
+        v = reference[ttt.board_key(board)]
+        board = ttt.result(board, engine.move(board))
+        if reference[ttt.board_key(board)] != v:
+            disagreements += 1
+    return ttt.winner(board), disagreements
+
+
+def main():
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        sys.exit("Usage: python benchmark.py [games] [engine ...]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    names = sys.argv[2:] or DEFAULT_ENGINES
+    for name in names:
+        if name not in ENGINES:
+            sys.exit(f"Unknown engine {name}, choose from {', '.join(ENGINES)}")
+
+    reference = solve(ttt.initial_state())
+    engines = {name: ENGINES[name]() for name in names}
+    results = {}
+    disagreements = 0
+
+    # Play every engine against every engine, as both X and O
+    for name_x, name_o in itertools.product(names, repeat=2):
+        outcomes = {ttt.X: 0, ttt.O: 0, None: 0}
+        for i in range(games):
+            winner, errors = play(engines[name_x], engines[name_o], reference)
+            outcomes[winner] += 1
+            disagreements += errors
+        results[(name_x, name_o)] = outcomes
+
+    print(f"Self-play results ({games} games per pairing)")
+    for (name_x, name_o), outcomes in results.items():
+        print(f"  {name_x} (X) vs {name_o} (O): "
+              f"X {outcomes[ttt.X]}, O {outcomes[ttt.O]}, tie {outcomes[None]}")
+
+    print()
+    print(f"{'engine':<10} {'moves':>7} {'nodes/move':>12} {'ms/move':>9} {'hit rate':>9}")
+    for name, engine in engines.items():
+        moves = max(engine.moves, 1)
+        rate = engine.hit_rate()
+        rate = "-" if rate is None else f"{rate:.1%}"
+        nodes = "-" if engine.nodes is None else f"{engine.nodes / moves:.1f}"
+        print(f"{name:<10} {engine.moves:>7} {nodes:>12} "
+              f"{1000 * engine.seconds / moves:>9.3f} {rate:>9}")
+
+    # Every value an engine cached must match the solved game
+    for engine in engines.values():
+        if engine.cache is not None:
+            disagreements += sum(
+                value != reference[key] for key, value in engine.cache.items()
+            )
+
+    print()
+    if disagreements:
+        print(f"Engines disagreed with the game values {disagreements} times")
+    else:
+        print("All engines agree on game values")
+
+
+if __name__ == "__main__":
+    main()
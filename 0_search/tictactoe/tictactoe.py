@@ -4,6 +4,7 @@ Tic Tac Toe Player
 
 import math
 import copy
+from multiprocessing import Pool
 from random import random, randrange
 
 X = "X"
@@ -171,4 +172,80 @@ def min_value(board):
     v = 99
     for action in actions(board):
         v = min(v, max_value(result(board, action)))
-    return v
\ No newline at end of file
+    return v
+
+
+def parallel_minimax(board, processes=None, split_depth=1):
+    """
+    Returns the optimal action for the current player on the board,
+    searching the subtrees below `split_depth` plies in a process pool.
+
+    Positions reached by different move orders are only sent to the
+    pool once, through a transposition table keyed by the board.
+    """
+    if terminal(board):
+        return None
+
+    # Collect the distinct positions found at the split depth
+    table = {}
+    split(board, max(1, split_depth), table)
+
+    # Evaluate each subtree on its own worker process
+    with Pool(processes) as pool:
+        values = pool.map(subtree_value, table.values())
+    table = dict(zip(table.keys(), values))
+
+    # Back the values up to the root, keeping every best action
+    maximizing = player(board) == X
+    v = -99 if maximizing else 99
+    for action in actions(board):
+        val = backed_up_value(result(board, action), split_depth - 1, table)
+        if (maximizing and val > v) or (not maximizing and val < v):
+            options = [action]
+            v = val
+        elif val == v:
+            options.append(action)
+
+    return options[randrange(len(options))]
+
+
+def board_key(board):
+    """
+    Returns a hashable key representing the board.
+    """
+    return tuple(tuple(row) for row in board)
+
+
+def split(board, depth, table):
+    """
+    Adds to `table` every position `depth` plies below the board,
+    stopping early at terminal boards.
+    """
+    if depth == 0 or terminal(board):
+        table.setdefault(board_key(board), board)
+        return
+    for action in actions(board):
+        split(result(board, action), depth - 1, table)
+
+
+def subtree_value(board):
+    """
+    Returns the minimax value of the board for the player to move.
+    """
+    if player(board) == X:
+        return max_value(board)
+    return min_value(board)
+
+
+def backed_up_value(board, depth, table):
+    """
+    Returns the minimax value of the board, reading the positions at
+    `depth` plies below it from the transposition table.
+    """
+    if depth <= 0 or terminal(board):
+        return table[board_key(board)]
+    values = [backed_up_value(result(board, action), depth - 1, table)
+              for action in actions(board)]
+    if player(board) == X:
+        return max(values)
+    return min(values)
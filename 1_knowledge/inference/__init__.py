@@ -0,0 +1,43 @@
+"""
+Propositional logic sentences and entailment checkers,
+shared by every program in 1_knowledge.
+"""
+
+from .cnf import CNF, Solver
+from .entailment import (
+    BACKENDS,
+    compiled_check,
+    forward_check,
+    model_check,
+    parallel_check,
+    sat_check,
+    truth_table_check,
+    vectorized_check,
+)
+from .horn import forward_chain, horn_clauses
+from .knowledge import KnowledgeBase, backbone, sat_backbone
+from .parser import load, load_dimacs, parse
+from .sentences import (
+    And,
+    AtLeastK,
+    AtMostK,
+    Biconditional,
+    Cardinality,
+    EvaluationException,
+    ExactlyOne,
+    Implication,
+    Not,
+    Or,
+    Sentence,
+    Symbol,
+)
+
+__all__ = [
+    "And", "Biconditional", "EvaluationException", "Implication", "Not",
+    "Or", "Sentence", "Symbol",
+    "Cardinality", "AtMostK", "AtLeastK", "ExactlyOne",
+    "CNF", "Solver", "KnowledgeBase", "backbone", "sat_backbone",
+    "BACKENDS", "model_check", "truth_table_check", "compiled_check",
+    "vectorized_check", "sat_check", "forward_check", "parallel_check",
+    "forward_chain", "horn_clauses", "parse", "load", "load_dimacs",
+]
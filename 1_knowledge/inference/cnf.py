@@ -0,0 +1,375 @@
+from collections import defaultdict
+
+from .sentences import And, Cardinality, Implication, Not, Or, Symbol
+
+# Activity decay applied to solver variables after every conflict
+ACTIVITY_DECAY = 0.95
+
+
+class CNF():
+    """
+    Sentence in conjunctive normal form, stored as a list of clauses.
+    As in the DIMACS format, each clause is a list of nonzero integers,
+    where literal v is variable v and literal -v is its negation.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.names = [None]
+        self.variables = dict()
+
+    def variable(self, name=None):
+        """Returns the variable for a symbol name, or a fresh variable
+        for a Tseitin subformula if no name is given."""
+        if name in self.variables:
+            return self.variables[name]
+        self.names.append(name)
+        variable = len(self.names) - 1
+        if name is not None:
+            self.variables[name] = variable
+        return variable
+
+    def add(self, sentence):
+        """Adds clauses asserting that the sentence is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append([disjunct.tseitin(self)
+                                 for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-sentence.antecedent.tseitin(self),
+                                 sentence.consequent.tseitin(self)])
+        elif isinstance(sentence, Cardinality):
+            sentence.encode(self)
+        else:
+            self.clauses.append([sentence.tseitin(self)])
+
+    def at_most(self, literals, k):
+        """Adds clauses asserting that at most k literals are true, with
+        a sequential counter: O(n * k) clauses instead of O(n ** k)."""
+        n = len(literals)
+        if k >= n:
+            return
+        if k < 0:
+            self.clauses.append([])
+            return
+        if k == 0:
+            for literal in literals:
+                self.clauses.append([-literal])
+            return
+
+        # counter[j] is true if at least j + 1 of the literals so far are
+        previous = None
+        for i, literal in enumerate(literals):
+            if previous is not None:
+                self.clauses.append([-literal, -previous[k - 1]])
+            if i == n - 1:
+                break
+            counter = [self.variable() for j in range(k)]
+            self.clauses.append([-literal, counter[0]])
+            if previous is None:
+                for j in range(1, k):
+                    self.clauses.append([-counter[j]])
+            else:
+                for j in range(k):
+                    self.clauses.append([-previous[j], counter[j]])
+                for j in range(1, k):
+                    self.clauses.append([-literal, -previous[j - 1],
+                                         counter[j]])
+            previous = counter
+
+    def at_least(self, literals, k):
+        """Adds clauses asserting that at least k literals are true."""
+        if k <= 0:
+            return
+        if k == 1:
+            self.clauses.append(list(literals))
+        else:
+            self.at_most([-literal for literal in literals], len(literals) - k)
+
+    def totalizer(self, literals):
+        """Returns literals r where r[j] is true exactly when at least
+        j + 1 of `literals` are true, adding the clauses of a totalizer."""
+        if len(literals) <= 1:
+            return list(literals)
+        middle = len(literals) // 2
+        left = self.totalizer(literals[:middle])
+        right = self.totalizer(literals[middle:])
+        total = [self.variable() for j in range(len(left) + len(right))]
+        for i in range(len(left) + 1):
+            for j in range(len(right) + 1):
+
+                # At least i on the left and j on the right make i + j
+                if i + j > 0:
+                    clause = [total[i + j - 1]]
+                    if i > 0:
+                        clause.append(-left[i - 1])
+                    if j > 0:
+                        clause.append(-right[j - 1])
+                    self.clauses.append(clause)
+
+                # At most i on the left and j on the right make i + j
+                if i + j < len(total):
+                    clause = [-total[i + j]]
+                    if i < len(left):
+                        clause.append(left[i])
+                    if j < len(right):
+                        clause.append(right[j])
+                    self.clauses.append(clause)
+        return total
+
+    def between(self, literals, low, high):
+        """Returns a literal that is true exactly when between low and
+        high of `literals` are true."""
+        total = self.totalizer(literals)
+        conditions = []
+        if low > len(total) or high < 0 or low > high:
+            conditions.append(None)
+        if 0 < low <= len(total):
+            conditions.append(total[low - 1])
+        if 0 <= high < len(total):
+            conditions.append(-total[high])
+        x = self.variable()
+        for condition in conditions:
+            if condition is None:
+                self.clauses.append([-x])
+            else:
+                self.clauses.append([-x, condition])
+        if None not in conditions:
+            self.clauses.append([x] + [-condition for condition in conditions])
+        return x
+
+    def symbol(self, literal):
+        """Returns the sentence for an integer literal."""
+        name = self.names[abs(literal)]
+        symbol = Symbol(f"_{abs(literal)}" if name is None else name)
+        return symbol if literal > 0 else Not(symbol)
+
+    def sentence(self):
+        """Returns the clauses as an And of Ors of literals."""
+        return And(*[Or(*[self.symbol(literal) for literal in clause])
+                     for clause in self.clauses])
+
+
+class Solver():
+    """
+    Conflict-driven clause learning SAT solver, with two watched literals
+    per clause, first-UIP clause learning and non-chronological backjumping.
+    """
+
+    def __init__(self, clauses=()):
+        self.ok = True
+        self.model = None
+
+        # Current assignment, as a trail of literals split into levels
+        self.values = dict()
+        self.levels = dict()
+        self.reasons = dict()
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+
+        # Clauses watching each literal, and branching heuristics
+        self.watches = defaultdict(list)
+        self.variables = set()
+        self.activity = defaultdict(float)
+        self.increment = 1.0
+        self.phases = dict()
+        self.learned = 0
+
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def value(self, literal):
+        """Returns the truth value of a literal, or None if unassigned."""
+        value = self.values.get(abs(literal))
+        if value is None:
+            return None
+        return value == (literal > 0)
+
+    def level(self):
+        """Returns the current decision level."""
+        return len(self.trail_limits)
+
+    def add_clause(self, clause):
+        """Adds a clause of integer literals to the solver."""
+        self.backtrack(0)
+        self.variables.update(abs(literal) for literal in clause)
+        literals = []
+        for literal in clause:
+            if -literal in literals or self.value(literal) is True:
+                return
+            if literal not in literals and self.value(literal) is None:
+                literals.append(literal)
+        if not self.ok:
+            return
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self.assign(literals[0], None)
+            self.ok = self.propagate() is None
+        else:
+            self.watches[literals[0]].append(literals)
+            self.watches[literals[1]].append(literals)
+
+    def assign(self, literal, reason):
+        """Makes a literal true, because of `reason` clause or a decision."""
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = self.level()
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """Assigns every literal implied by unit propagation,
+        returning a conflicting clause or None."""
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches[false_literal]
+            self.watches[false_literal] = kept = []
+            for n, clause in enumerate(watching):
+
+                # Keep the false literal in the second watched position
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                if self.value(clause[0]) is True:
+                    kept.append(clause)
+                    continue
+
+                # Look for another literal to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], clause[1]
+                        self.watches[clause[1]].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watching[n + 1:])
+                        return clause
+                    self.assign(clause[0], clause)
+        return None
+
+    def analyze(self, conflict):
+        """Returns the first-UIP clause learned from a conflict,
+        and the level to backjump to."""
+        seen = set()
+        learned = [None]
+        counter = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.levels[variable] > 0:
+                    seen.add(variable)
+                    self.bump(variable)
+                    if self.levels[variable] == self.level():
+                        counter += 1
+                    else:
+                        learned.append(other)
+
+            # Walk back to the most recent literal involved in the conflict
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            counter -= 1
+            if counter == 0:
+                break
+            clause = self.reasons[abs(literal)]
+        learned[0] = -literal
+
+        # Watch the literal assigned last among the rest of the clause
+        if len(learned) == 1:
+            return learned, 0
+        highest = max(range(1, len(learned)),
+                      key=lambda k: self.levels[abs(learned[k])])
+        learned[1], learned[highest] = learned[highest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def bump(self, variable):
+        """Increases the activity of a variable involved in a conflict."""
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            for v in self.activity:
+                self.activity[v] *= 1e-100
+            self.increment *= 1e-100
+
+    def backtrack(self, level):
+        """Undoes every assignment made above the given decision level."""
+        if self.level() <= level:
+            return
+        for literal in self.trail[self.trail_limits[level]:]:
+            variable = abs(literal)
+            self.phases[variable] = self.values.pop(variable)
+            del self.levels[variable]
+            del self.reasons[variable]
+        del self.trail[self.trail_limits[level]:]
+        del self.trail_limits[level:]
+        self.head = len(self.trail)
+
+    def decide(self):
+        """Returns the unassigned variable with the highest activity,
+        or None if every variable is assigned."""
+        best = None
+        for variable in self.variables:
+            if variable not in self.values and (
+                best is None or self.activity[variable] > self.activity[best]
+            ):
+                best = variable
+        return best
+
+    def solve(self, assumptions=()):
+        """Returns True if the clauses are satisfiable when every literal in
+        `assumptions` is true, storing a satisfying model in self.model."""
+        self.model = None
+        if not self.ok:
+            return False
+        self.backtrack(0)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+
+                # A conflict without decisions means the clauses are unsatisfiable
+                if self.level() == 0:
+                    self.ok = False
+                    return False
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                self.learned += 1
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.watches[learned[0]].append(learned)
+                    self.watches[learned[1]].append(learned)
+                    self.assign(learned[0], learned)
+                self.increment /= ACTIVITY_DECAY
+
+            # Decide assumptions first, each on its own level
+            elif self.level() < len(assumptions):
+                literal = assumptions[self.level()]
+                value = self.value(literal)
+                if value is False:
+                    self.backtrack(0)
+                    return False
+                self.trail_limits.append(len(self.trail))
+                if value is None:
+                    self.assign(literal, None)
+
+            else:
+                variable = self.decide()
+                if variable is None:
+                    self.model = dict(self.values)
+                    self.backtrack(0)
+                    return True
+                self.trail_limits.append(len(self.trail))
+                if self.phases.get(variable, False):
+                    self.assign(variable, None)
+                else:
+                    self.assign(-variable, None)
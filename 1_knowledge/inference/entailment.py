@@ -0,0 +1,174 @@
+import itertools
+import math
+import os
+from collections import Counter
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .cnf import CNF, Solver
+from .horn import forward_chain, horn_clauses
+from .sentences import Not
+
+# Number of models evaluated at once by vectorized_check
+CHUNK_SIZE = 2 ** 20
+
+
+def model_check(knowledge, query, backend="truth-table"):
+    """Checks if knowledge base entails query, using the named backend."""
+    try:
+        check = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"unknown backend {backend}, "
+                         f"choose from {', '.join(BACKENDS)}")
+    return check(knowledge, query)
+
+
+def truth_table_check(knowledge, query):
+    """Checks if knowledge base entails query, enumerating models and
+    pruning those in which knowledge base is already false."""
+    symbols = branching_order(knowledge, query)
+    return check_all(knowledge, query, symbols, dict())
+
+
+def branching_order(knowledge, query):
+    """Returns the symbols of knowledge base and query, ordered to branch
+    first on the symbols that occur most often in knowledge base."""
+    counts = Counter()
+    knowledge.count_symbols(counts)
+    return sorted(knowledge.symbols() | query.symbols(),
+                  key=lambda symbol: (-counts[symbol], symbol))
+
+
+def check_all(knowledge, query, symbols, model):
+    """Checks if knowledge base entails query, given a partial model
+    assigning the first len(model) symbols."""
+
+    # If knowledge base is false in every completion of model, skip them
+    kb = knowledge.evaluate_partial(model)
+    if kb is False:
+        return True
+
+    # If knowledge base is true in every completion of model,
+    # query may already be known too
+    if kb is True:
+        value = query.evaluate_partial(model)
+        if value is not None:
+            return value
+
+    # Choose the next unused symbol, extending model in place
+    p = symbols[len(model)]
+    model[p] = True
+    holds = check_all(knowledge, query, symbols, model)
+    if holds:
+        model[p] = False
+        holds = check_all(knowledge, query, symbols, model)
+    del model[p]
+    return holds
+
+
+def parallel_check(knowledge, query, processes=None, split=None):
+    """Checks if knowledge base entails query, fixing the first `split`
+    symbols in each possible way and checking the resulting 2 ** split
+    subproblems in a process pool. Stops as soon as any worker finds a
+    model where knowledge base is true and query is false."""
+    symbols = branching_order(knowledge, query)
+    if split is None:
+        workers = processes or os.cpu_count() or 1
+        split = math.ceil(math.log2(4 * workers))
+    split = min(split, len(symbols))
+
+    tasks = [
+        (knowledge, query, symbols, dict(zip(symbols, values)))
+        for values in itertools.product((True, False), repeat=split)
+    ]
+    with Pool(processes) as pool:
+        for holds in pool.imap_unordered(check_task, tasks):
+            if not holds:
+                pool.terminate()
+                return False
+    return True
+
+
+def check_task(task):
+    """Runs check_all on a (knowledge, query, symbols, model) task."""
+    return check_all(*task)
+
+
+def compiled_check(knowledge, query):
+    """Checks if knowledge base entails query, enumerating every model
+    with both sentences compiled to Python functions."""
+
+    # Get all symbols in both knowledge and query
+    symbols = sorted(knowledge.symbols() | query.symbols())
+
+    # Compile both sentences into functions of a tuple of truth values
+    knowledge = knowledge.compile(symbols)
+    query = query.compile(symbols)
+
+    # If knowledge base is true in a model, then query must also be true
+    for model in itertools.product((True, False), repeat=len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+def vectorized_check(knowledge, query, chunk_size=CHUNK_SIZE):
+    """Checks if knowledge base entails query, evaluating both sentences
+    on blocks of `chunk_size` models at a time as NumPy arrays."""
+    if np is None:
+        raise ImportError("vectorized_check requires numpy")
+
+    # Get all symbols in both knowledge and query
+    symbols = sorted(knowledge.symbols() | query.symbols())
+    knowledge = knowledge.compile(symbols, vector=True)
+    query = query.compile(symbols, vector=True)
+
+    # Model number k assigns symbol i the value of bit i of k
+    total = 2 ** len(symbols)
+    for start in range(0, total, chunk_size):
+        numbers = np.arange(start, min(start + chunk_size, total),
+                            dtype=np.int64)
+        model = tuple((numbers >> i) & 1 == 1 for i in range(len(symbols)))
+
+        # If knowledge base is true in a model, then query must also be true
+        counterexamples = knowledge(model) & ~np.asarray(query(model))
+        if np.any(counterexamples):
+            return False
+    return True
+
+
+def sat_check(knowledge, query):
+    """Checks if knowledge base entails query, by testing whether
+    knowledge and the negation of query are unsatisfiable together."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    cnf.add(Not(query))
+    return not Solver(cnf.clauses).solve()
+
+
+def forward_check(knowledge, query):
+    """Checks if knowledge base entails query by forward chaining, when the
+    knowledge base and the negation of query are sets of Horn clauses,
+    falling back to truth_table_check when they are not."""
+    clauses = horn_clauses(knowledge)
+    negation = horn_clauses(query, negated=True)
+    if clauses is None or negation is None:
+        return truth_table_check(knowledge, query)
+
+    # Knowledge base entails query if it contradicts the negation of query
+    return forward_chain(clauses + negation) is None
+
+
+# Entailment checkers selectable by name in model_check
+BACKENDS = {
+    "truth-table": truth_table_check,
+    "compiled": compiled_check,
+    "vectorized": vectorized_check,
+    "sat": sat_check,
+    "forward": forward_check,
+    "parallel": parallel_check,
+}
@@ -0,0 +1,116 @@
+from collections import defaultdict
+
+from .sentences import (
+    And, Biconditional, Cardinality, Implication, Not, Or, Symbol
+)
+
+
+def horn_clauses(sentence, negated=False):
+    """Returns the clauses of the sentence, or of its negation, as a list of
+    frozensets of (symbol, value) literals. Returns None if some clause
+    has more than one positive literal, so is not a Horn clause."""
+    if isinstance(sentence, Symbol):
+        return [frozenset([(sentence.name, not negated)])]
+    if isinstance(sentence, Not):
+        return horn_clauses(sentence.operand, not negated)
+    if isinstance(sentence, Implication):
+        if negated:
+            parts = [sentence.antecedent, Not(sentence.consequent)]
+            return clause_conjunction(parts)
+        return clause_disjunction([Not(sentence.antecedent),
+                                   sentence.consequent])
+    if isinstance(sentence, Biconditional):
+        left, right = sentence.left, sentence.right
+        if negated:
+            parts = [Or(left, right), Or(Not(left), Not(right))]
+        else:
+            parts = [Or(Not(left), right), Or(left, Not(right))]
+        return clause_conjunction(parts)
+
+    if isinstance(sentence, Cardinality):
+        return None
+
+    # Negating swaps conjunctions and disjunctions
+    if isinstance(sentence, And):
+        operands = sentence.conjuncts
+        conjunction = not negated
+    else:
+        operands = sentence.disjuncts
+        conjunction = negated
+    if negated:
+        operands = [Not(operand) for operand in operands]
+    if conjunction:
+        return clause_conjunction(operands)
+    return clause_disjunction(operands)
+
+
+def clause_conjunction(sentences):
+    """Returns the Horn clauses of the conjunction of sentences."""
+    clauses = []
+    for sentence in sentences:
+        operand = horn_clauses(sentence)
+        if operand is None:
+            return None
+        clauses.extend(operand)
+    return clauses
+
+
+def clause_disjunction(sentences):
+    """Returns the Horn clauses of the disjunction of sentences,
+    distributing it over the clauses of each sentence."""
+    clauses = [frozenset()]
+    for sentence in sentences:
+        operand = horn_clauses(sentence)
+        if operand is None:
+            return None
+        combined = []
+        for clause in clauses:
+            for other in operand:
+                union = clause | other
+                names = [name for name, value in union]
+                if len(set(names)) < len(names):
+                    continue
+                if sum(value for name, value in union) > 1:
+                    return None
+                combined.append(union)
+        clauses = combined
+    return clauses
+
+
+def forward_chain(clauses):
+    """Returns the set of symbols inferred true from Horn clauses by forward
+    chaining, or None if the clauses are contradictory. Runs in time
+    linear in the total size of the clauses."""
+
+    # Count the premises of each clause not yet known to be true
+    premises = []
+    conclusions = []
+    watching = defaultdict(list)
+    agenda = []
+    for clause in clauses:
+        names = [name for name, value in clause if not value]
+        conclusion = [name for name, value in clause if value]
+        k = len(premises)
+        premises.append(len(names))
+        conclusions.append(conclusion[0] if conclusion else None)
+        for name in names:
+            watching[name].append(k)
+        if not names:
+            if not conclusion:
+                return None
+            agenda.append(conclusion[0])
+
+    # Fire a clause once all of its premises have been inferred
+    inferred = set()
+    while agenda:
+        p = agenda.pop()
+        if p in inferred:
+            continue
+        inferred.add(p)
+        for k in watching[p]:
+            premises[k] -= 1
+            if premises[k] == 0:
+                if conclusions[k] is None:
+                    return None
+                agenda.append(conclusions[k])
+    return inferred
@@ -0,0 +1,114 @@
+import itertools
+
+from .cnf import CNF, Solver
+from .sentences import Sentence
+
+
+class KnowledgeBase():
+    """
+    Knowledge base that enumerates its models once, keeping every model
+    in which all of its sentences are true, and answers queries from them.
+    """
+
+    def __init__(self, *sentences):
+        self.sentences = []
+        self.symbols = []
+        self.models = [()]
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """Adds a sentence, keeping only the models where it is true."""
+        Sentence.validate(sentence)
+
+        # Split each model on the symbols not seen before
+        new = sorted(sentence.symbols() - set(self.symbols))
+        if new:
+            self.symbols += new
+            self.models = [
+                model + values
+                for model in self.models
+                for values in itertools.product((True, False), repeat=len(new))
+            ]
+
+        evaluate = sentence.compile(self.symbols)
+        self.models = [model for model in self.models if evaluate(model)]
+        self.sentences.append(sentence)
+
+    def truth_values(self, query):
+        """Yields the truth value of query in every model
+        of the knowledge base."""
+        extra = sorted(query.symbols() - set(self.symbols))
+        evaluate = query.compile(self.symbols + extra)
+        for model in self.models:
+            for values in itertools.product((True, False), repeat=len(extra)):
+                yield evaluate(model + values)
+
+    def entails(self, query):
+        """Checks if knowledge base entails query."""
+        return all(self.truth_values(query))
+
+    def possible(self, query):
+        """Checks if query is true in some model of the knowledge base."""
+        return any(self.truth_values(query))
+
+    def backbone(self):
+        """Returns the symbols with the same truth value in every model of
+        the knowledge base, as in backbone()."""
+        return common_values(self.symbols, self.models)
+
+
+def backbone(knowledge):
+    """Returns a dict mapping each symbol that has the same truth value in
+    every model of the knowledge base to that value, enumerating the models
+    only once. Returns None if the knowledge base has no models."""
+    symbols = sorted(knowledge.symbols())
+    knowledge = knowledge.compile(symbols)
+    models = itertools.product((True, False), repeat=len(symbols))
+    return common_values(symbols, filter(knowledge, models))
+
+
+def sat_backbone(knowledge):
+    """Returns the same dict as backbone(), using the SAT solver instead of
+    enumerating models: each symbol is tested once, by solving with its
+    value flipped, and every model found rules out more candidates."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    solver = Solver(cnf.clauses)
+    if not solver.solve():
+        return None
+
+    # Every symbol in some clause starts as a candidate,
+    # with its value in the first model
+    candidates = {name: solver.model[cnf.variables[name]]
+                  for name in sorted(knowledge.symbols())
+                  if cnf.variables[name] in solver.model}
+    for name in list(candidates):
+        if name not in candidates:
+            continue
+        variable = cnf.variables[name]
+        flipped = -variable if candidates[name] else variable
+        if solver.solve([flipped]):
+            for other in list(candidates):
+                if solver.model[cnf.variables[other]] != candidates[other]:
+                    del candidates[other]
+        else:
+            solver.add_clause([-flipped])
+    return candidates
+
+
+def common_values(symbols, models):
+    """Returns a dict mapping each symbol to its truth value if it is the
+    same in all `models`, or None if there are no models."""
+    candidates = None
+    for model in models:
+        if candidates is None:
+            candidates = list(enumerate(model))
+        else:
+            candidates = [(i, value) for i, value in candidates
+                          if model[i] == value]
+        if not candidates:
+            break
+    if candidates is None:
+        return None
+    return {symbols[i]: value for i, value in candidates}
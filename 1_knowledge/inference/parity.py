@@ -0,0 +1,111 @@
+"""
+Checks that every entailment backend gives the same answers.
+
+Usage: python -m inference.parity [trials]
+"""
+
+import random
+import sys
+
+from .entailment import BACKENDS, np
+from .sentences import (
+    And, AtLeastK, AtMostK, Biconditional, ExactlyOne, Implication, Not, Or,
+    Symbol
+)
+
+TRIALS = 500
+
+
+def random_sentence(symbols, depth):
+    """Returns a random sentence over `symbols`, nested up to `depth`."""
+    if depth == 0 or random.random() < 0.2:
+        symbol = random.choice(symbols)
+        return symbol if random.random() < 0.6 else Not(symbol)
+    kind = random.choice([Not, And, Or, Implication, Biconditional,
+                          AtMostK, AtLeastK, ExactlyOne])
+    if kind is Not:
+        return Not(random_sentence(symbols, depth - 1))
+    if kind in (AtMostK, AtLeastK):
+        operands = [random_sentence(symbols, depth - 1)
+                    for i in range(random.randint(0, 3))]
+        return kind(random.randint(0, len(operands)), *operands)
+    if kind is ExactlyOne:
+        return ExactlyOne(*[random_sentence(symbols, depth - 1)
+                            for i in range(random.randint(0, 3))])
+    if kind in (And, Or):
+        return kind(*[random_sentence(symbols, depth - 1)
+                      for i in range(random.randint(1, 3))])
+    return kind(random_sentence(symbols, depth - 1),
+                random_sentence(symbols, depth - 1))
+
+
+def permutation(n, cardinality=False):
+    """Returns a knowledge base placing n items in n positions,
+    one item per position, with item i ruled out of position i.
+    Uses ExactlyOne if `cardinality` is true, pairwise clauses if not."""
+    symbols = [[Symbol(f"item{i}pos{j}") for j in range(n)] for i in range(n)]
+    knowledge = []
+    for i in range(n):
+        if cardinality:
+            knowledge.append(ExactlyOne(*symbols[i]))
+            knowledge.append(ExactlyOne(*[symbols[j][i] for j in range(n)]))
+            knowledge.append(Not(symbols[i][i]))
+            continue
+        knowledge.append(Or(*symbols[i]))
+        knowledge.append(Or(*[symbols[j][i] for j in range(n)]))
+        knowledge.append(Not(symbols[i][i]))
+        for j in range(n):
+            for k in range(n):
+                if j != k:
+                    knowledge.append(Implication(symbols[i][j],
+                                                 Not(symbols[i][k])))
+                    knowledge.append(Implication(symbols[j][i],
+                                                 Not(symbols[k][i])))
+    return And(*knowledge), [s for row in symbols for s in row]
+
+
+def problems(trials):
+    """Yields (knowledge, query) pairs to check."""
+    for i in range(trials):
+        symbols = [Symbol(name) for name in "ABCDEFG"[:random.randint(1, 7)]]
+        knowledge = And(*[random_sentence(symbols, 3)
+                          for j in range(random.randint(1, 4))])
+        yield knowledge, random_sentence(symbols, 2)
+    for cardinality in (False, True):
+        knowledge, symbols = permutation(3, cardinality)
+        for symbol in symbols:
+            yield knowledge, symbol
+            yield knowledge, Not(symbol)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python -m inference.parity [trials]")
+    trials = int(sys.argv[1]) if len(sys.argv) == 2 else TRIALS
+    random.seed(0)
+
+    backends = dict(BACKENDS)
+    if np is None:
+        print("numpy not installed, skipping vectorized backend")
+        del backends["vectorized"]
+
+    checked = 0
+    failures = 0
+    for knowledge, query in problems(trials):
+        results = {name: check(knowledge, query)
+                   for name, check in backends.items()}
+        checked += 1
+        if len(set(results.values())) > 1:
+            failures += 1
+            print(f"Backends disagree on {knowledge.formula()} |= {query.formula()}")
+            for name, result in results.items():
+                print(f"    {name}: {result}")
+
+    print(f"{checked} problems checked on {', '.join(backends)}: "
+          f"{failures} disagreements")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
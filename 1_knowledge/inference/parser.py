@@ -0,0 +1,234 @@
+import os
+import pickle
+import re
+
+from .cnf import CNF
+from .sentences import (
+    And,
+    AtLeastK,
+    AtMostK,
+    Biconditional,
+    ExactlyOne,
+    Implication,
+    Not,
+    Or,
+    Symbol,
+)
+
+# Operators as printed by Sentence.formula(), with ASCII alternatives
+OPERATORS = {
+    "¬": "¬", "~": "¬", "!": "¬",
+    "∧": "∧", "&": "∧",
+    "∨": "∨", "|": "∨",
+    "=>": "=>",
+    "<=>": "<=>",
+    "(": "(", ")": ")", ",": ",",
+}
+TOKENS = re.compile(r"(<=>|=>|[¬~!∧&∨|(),])")
+
+# Cardinality sentences, printed as Name(k, operands...) or, for
+# ExactlyOne, Name(operands...)
+CARDINALITIES = {"AtMostK": AtMostK, "AtLeastK": AtLeastK}
+
+
+def tokenize(text):
+    """Splits a formula into operators and symbol names. Names are the
+    text between operators, so they may contain spaces but not commas."""
+    tokens = []
+    for part in TOKENS.split(text):
+        if part in OPERATORS:
+            tokens.append(OPERATORS[part])
+        elif part.strip():
+            tokens.append(part.strip())
+    return tokens
+
+
+class Parser():
+    """
+    Recursive descent parser for formulas in the syntax printed by
+    Sentence.formula(). From tightest to loosest binding, the operators
+    are ¬, ∧, ∨, => (right associative) and <=>. Cardinality sentences
+    are written as calls, such as AtMostK(1, a, b) or ExactlyOne(a, b).
+    """
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        """Returns the next token, or None at the end of the formula."""
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self):
+        """Consumes and returns the next token."""
+        token = self.peek()
+        if token is None:
+            raise ValueError("unexpected end of formula")
+        self.position += 1
+        return token
+
+    def parse(self):
+        """Parses the whole formula."""
+        if not self.tokens:
+            return And()
+        sentence = self.biconditional()
+        if self.peek() is not None:
+            raise ValueError(f"unexpected {self.peek()!r} in formula")
+        return sentence
+
+    def biconditional(self):
+        sentence = self.implication()
+        while self.peek() == "<=>":
+            self.next()
+            sentence = Biconditional(sentence, self.implication())
+        return sentence
+
+    def implication(self):
+        sentence = self.disjunction()
+        if self.peek() == "=>":
+            self.next()
+            return Implication(sentence, self.implication())
+        return sentence
+
+    def disjunction(self):
+        disjuncts = [self.conjunction()]
+        while self.peek() == "∨":
+            self.next()
+            disjuncts.append(self.conjunction())
+        return disjuncts[0] if len(disjuncts) == 1 else Or(*disjuncts)
+
+    def conjunction(self):
+        conjuncts = [self.negation()]
+        while self.peek() == "∧":
+            self.next()
+            conjuncts.append(self.negation())
+        return conjuncts[0] if len(conjuncts) == 1 else And(*conjuncts)
+
+    def negation(self):
+        token = self.next()
+        if token == "¬":
+            return Not(self.negation())
+        if token == "(":
+            sentence = self.biconditional()
+            if self.next() != ")":
+                raise ValueError("expected ')' in formula")
+            return sentence
+        if token in OPERATORS.values():
+            raise ValueError(f"unexpected {token!r} in formula")
+        if self.peek() == "(" and (
+            token == "ExactlyOne" or token in CARDINALITIES
+        ):
+            return self.cardinality(token)
+        return Symbol(token)
+
+    def cardinality(self, name):
+        """Parses the arguments of a cardinality sentence."""
+        self.next()
+        if name == "ExactlyOne":
+            return ExactlyOne(*self.arguments())
+        k = self.next()
+        if not k.isdigit():
+            raise ValueError(f"expected a count in {name}, got {k!r}")
+        if self.peek() == ",":
+            self.next()
+        return CARDINALITIES[name](int(k), *self.arguments())
+
+    def arguments(self):
+        """Parses comma separated formulas up to a closing parenthesis."""
+        operands = []
+        if self.peek() != ")":
+            operands.append(self.biconditional())
+            while self.peek() == ",":
+                self.next()
+                operands.append(self.biconditional())
+        if self.next() != ")":
+            raise ValueError("expected ')' in formula")
+        return operands
+
+
+def parse(text):
+    """Returns the sentence for a formula, such as one printed
+    by Sentence.formula()."""
+    return Parser(text).parse()
+
+
+def load(path, cache=True):
+    """Loads a knowledge base from a file, as the And of its sentences.
+    DIMACS CNF files are read as clauses over symbols x1, x2, ...; any
+    other file has one formula per line, with # starting a comment.
+
+    If `cache` is true, the knowledge base is pickled next to the file
+    and reused by later runs until the file changes."""
+    cache_path = f"{path}.cache"
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    if cache and os.path.exists(cache_path):
+        with open(cache_path, "rb") as f:
+            cached_version, knowledge = pickle.load(f)
+        if cached_version == version:
+            return knowledge
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    if is_dimacs(lines):
+        knowledge = read_dimacs(lines).sentence()
+    else:
+        knowledge = And(*[
+            parse(line.split("#")[0])
+            for line in lines if line.split("#")[0].strip()
+        ])
+
+    if cache:
+        with open(cache_path, "wb") as f:
+            pickle.dump((version, knowledge), f)
+    return knowledge
+
+
+def is_dimacs(lines):
+    """Checks if the lines of a file are in DIMACS CNF format."""
+    for line in lines:
+        if line.strip() and not line.startswith("c"):
+            return line.startswith("p cnf")
+    return False
+
+
+def read_dimacs(lines):
+    """Returns the CNF for the lines of a DIMACS CNF file, naming
+    variable v as symbol xv. Reading stops at a % line, which SATLIB
+    files put before a trailing 0."""
+    cnf = CNF()
+    literals = []
+    expected = None
+    for line in lines:
+        if line.startswith("%"):
+            break
+        if not line.strip() or line.startswith("c"):
+            continue
+        if line.startswith("p"):
+            variables, expected = map(int, line.split()[2:4])
+            for variable in range(1, variables + 1):
+                cnf.variable(f"x{variable}")
+            continue
+        for literal in map(int, line.split()):
+            if literal == 0:
+                cnf.clauses.append(literals)
+                literals = []
+            else:
+                variable = cnf.variable(f"x{abs(literal)}")
+                literals.append(variable if literal > 0 else -variable)
+    if literals:
+        cnf.clauses.append(literals)
+    if expected is not None and len(cnf.clauses) != expected:
+        raise ValueError(
+            f"DIMACS header declares {expected} clauses, "
+            f"found {len(cnf.clauses)}"
+        )
+    return cnf
+
+
+def load_dimacs(path):
+    """Returns the CNF for a DIMACS CNF file, ready for Solver."""
+    with open(path, encoding="utf-8") as f:
+        return read_dimacs(f.read().splitlines())
@@ -0,0 +1,517 @@
+import weakref
+
+
+class EvaluationException(Exception):
+    pass
+
+
+class Sentence():
+    """
+    Immutable node of a logical sentence. Sentences are hash-consed:
+    constructing a sentence equal to one that already exists returns
+    the existing object, so equality is identity and hashes are cached.
+    """
+
+    __slots__ = ("_args", "_hash", "_symbols", "__weakref__")
+
+    # Maps (class, constructor arguments) to the sentence built from them
+    interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, *args):
+        key = (cls, args)
+        sentence = Sentence.interned.get(key)
+        if sentence is None:
+            sentence = super().__new__(cls)
+            object.__setattr__(sentence, "_args", args)
+            object.__setattr__(sentence, "_hash", hash(key))
+            object.__setattr__(sentence, "_symbols", None)
+            sentence.setup(*args)
+            Sentence.interned[key] = sentence
+        return sentence
+
+    def setup(self, *args):
+        """Stores the constructor arguments in named attributes."""
+        for name, value in zip(type(self).__slots__, args):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("logical sentences are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("logical sentences are immutable")
+
+    def __eq__(self, other):
+        return self is other
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return (type(self), self._args)
+
+    def evaluate(self, model):
+        """Evaluates the logical sentence."""
+        raise Exception("nothing to evaluate")
+
+    def evaluate_partial(self, model):
+        """Evaluates the logical sentence in a model that may not assign
+        every symbol, returning True, False, or None if the value depends
+        on the symbols left unassigned."""
+        raise Exception("nothing to evaluate")
+
+    def formula(self):
+        """Returns string formula representing logical sentence."""
+        return ""
+
+    def symbols(self):
+        """Returns a frozenset of all symbols in the logical sentence."""
+        if self._symbols is None:
+            object.__setattr__(self, "_symbols", frozenset().union(
+                *[operand.symbols() for operand in self.children()]
+            ))
+        return self._symbols
+
+    def children(self):
+        """Returns the sentences the sentence is built from."""
+        return self._args
+
+    def count_symbols(self, counts):
+        """Adds the number of occurrences of each symbol to `counts`."""
+        for operand in self.children():
+            operand.count_symbols(counts)
+
+    def code(self, index, vector=False):
+        """Returns Python source evaluating the sentence, where `index`
+        maps each symbol name to its position in a tuple of truth values.
+        If `vector` is true, the values are NumPy boolean arrays."""
+        raise Exception("nothing to compile")
+
+    def compile(self, symbols, vector=False):
+        """Compiles the sentence into a function of a tuple of truth values,
+        one for each symbol name in `symbols`, in that order."""
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        return eval(f"lambda m: {self.code(index, vector)}")
+
+    def tseitin(self, cnf):
+        """Adds clauses defining the sentence to `cnf`, and returns the
+        integer literal that is true exactly when the sentence is true."""
+        raise Exception("nothing to encode")
+
+    def to_cnf(self):
+        """Returns an equisatisfiable sentence in conjunctive normal form,
+        introducing a fresh symbol for each compound subformula."""
+        from .cnf import CNF
+        cnf = CNF()
+        cnf.add(self)
+        return cnf.sentence()
+
+    @classmethod
+    def validate(cls, sentence):
+        if not isinstance(sentence, Sentence):
+            raise TypeError("must be a logical sentence")
+
+    @classmethod
+    def parenthesize(cls, s):
+        """Parenthesizes an expression if not already parenthesized."""
+        def balanced(s):
+            """Checks if a string has balanced parentheses."""
+            count = 0
+            for c in s:
+                if c == "(":
+                    count += 1
+                elif c == ")":
+                    if count <= 0:
+                        return False
+                    count -= 1
+            return count == 0
+        if not len(s) or s.isalpha() or (
+            s[0] == "(" and s[-1] == ")" and balanced(s[1:-1])
+        ):
+            return s
+        else:
+            return f"({s})"
+
+
+class Symbol(Sentence):
+    __slots__ = ("name",)
+
+    def __repr__(self):
+        return self.name
+
+    def evaluate(self, model):
+        try:
+            return bool(model[self.name])
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+
+    def evaluate_partial(self, model):
+        value = model.get(self.name)
+        return None if value is None else bool(value)
+
+    def formula(self):
+        return self.name
+
+    def symbols(self):
+        if self._symbols is None:
+            object.__setattr__(self, "_symbols", frozenset([self.name]))
+        return self._symbols
+
+    def count_symbols(self, counts):
+        counts[self.name] += 1
+
+    def code(self, index, vector=False):
+        try:
+            return f"m[{index[self.name]}]"
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+
+    def tseitin(self, cnf):
+        return cnf.variable(self.name)
+
+
+class Not(Sentence):
+    __slots__ = ("operand",)
+
+    def __new__(cls, operand):
+        Sentence.validate(operand)
+        return super().__new__(cls, operand)
+
+    def __repr__(self):
+        return f"Not({self.operand})"
+
+    def evaluate(self, model):
+        return not self.operand.evaluate(model)
+
+    def evaluate_partial(self, model):
+        value = self.operand.evaluate_partial(model)
+        return None if value is None else not value
+
+    def formula(self):
+        return "¬" + Sentence.parenthesize(self.operand.formula())
+
+    def code(self, index, vector=False):
+        # Unlike ~, == False also negates the plain bools of constant
+        # subformulas such as And()
+        if vector:
+            return f"({self.operand.code(index, vector)} == False)"
+        return f"(not {self.operand.code(index)})"
+
+    def tseitin(self, cnf):
+        return -self.operand.tseitin(cnf)
+
+
+class And(Sentence):
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
+        for conjunct in conjuncts:
+            Sentence.validate(conjunct)
+        return super().__new__(cls, *conjuncts)
+
+    def setup(self, *conjuncts):
+        object.__setattr__(self, "conjuncts", conjuncts)
+
+    def __repr__(self):
+        conjunctions = ", ".join(
+            [str(conjunct) for conjunct in self.conjuncts]
+        )
+        return f"And({conjunctions})"
+
+    def evaluate(self, model):
+        return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
+
+    def evaluate_partial(self, model):
+        result = True
+        for conjunct in self.conjuncts:
+            value = conjunct.evaluate_partial(model)
+            if value is False:
+                return False
+            if value is None:
+                result = None
+        return result
+
+    def formula(self):
+        if len(self.conjuncts) == 1:
+            return self.conjuncts[0].formula()
+        return " ∧ ".join([Sentence.parenthesize(conjunct.formula())
+                           for conjunct in self.conjuncts])
+
+    def code(self, index, vector=False):
+        if not self.conjuncts:
+            return "True"
+        operator = " & " if vector else " and "
+        return "(" + operator.join(
+            conjunct.code(index, vector) for conjunct in self.conjuncts
+        ) + ")"
+
+    def tseitin(self, cnf):
+        literals = [conjunct.tseitin(cnf) for conjunct in self.conjuncts]
+        x = cnf.variable()
+        for literal in literals:
+            cnf.clauses.append([-x, literal])
+        cnf.clauses.append([x] + [-literal for literal in literals])
+        return x
+
+
+class Or(Sentence):
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
+        for disjunct in disjuncts:
+            Sentence.validate(disjunct)
+        return super().__new__(cls, *disjuncts)
+
+    def setup(self, *disjuncts):
+        object.__setattr__(self, "disjuncts", disjuncts)
+
+    def __repr__(self):
+        disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
+        return f"Or({disjuncts})"
+
+    def evaluate(self, model):
+        return any(disjunct.evaluate(model) for disjunct in self.disjuncts)
+
+    def evaluate_partial(self, model):
+        result = False
+        for disjunct in self.disjuncts:
+            value = disjunct.evaluate_partial(model)
+            if value is True:
+                return True
+            if value is None:
+                result = None
+        return result
+
+    def formula(self):
+        if len(self.disjuncts) == 1:
+            return self.disjuncts[0].formula()
+        return " ∨  ".join([Sentence.parenthesize(disjunct.formula())
+                            for disjunct in self.disjuncts])
+
+    def code(self, index, vector=False):
+        if not self.disjuncts:
+            return "False"
+        operator = " | " if vector else " or "
+        return "(" + operator.join(
+            disjunct.code(index, vector) for disjunct in self.disjuncts
+        ) + ")"
+
+    def tseitin(self, cnf):
+        literals = [disjunct.tseitin(cnf) for disjunct in self.disjuncts]
+        x = cnf.variable()
+        for literal in literals:
+            cnf.clauses.append([x, -literal])
+        cnf.clauses.append([-x] + literals)
+        return x
+
+
+class Implication(Sentence):
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
+        Sentence.validate(antecedent)
+        Sentence.validate(consequent)
+        return super().__new__(cls, antecedent, consequent)
+
+    def __repr__(self):
+        return f"Implication({self.antecedent}, {self.consequent})"
+
+    def evaluate(self, model):
+        return ((not self.antecedent.evaluate(model))
+                or self.consequent.evaluate(model))
+
+    def evaluate_partial(self, model):
+        antecedent = self.antecedent.evaluate_partial(model)
+        if antecedent is False:
+            return True
+        consequent = self.consequent.evaluate_partial(model)
+        if consequent is True:
+            return True
+        if antecedent is None or consequent is None:
+            return None
+        return False
+
+    def formula(self):
+        antecedent = Sentence.parenthesize(self.antecedent.formula())
+        consequent = Sentence.parenthesize(self.consequent.formula())
+        return f"{antecedent} => {consequent}"
+
+    def code(self, index, vector=False):
+        antecedent = self.antecedent.code(index, vector)
+        consequent = self.consequent.code(index, vector)
+        if vector:
+            return f"(({antecedent} == False) | {consequent})"
+        return f"(not {antecedent} or {consequent})"
+
+    def tseitin(self, cnf):
+        antecedent = self.antecedent.tseitin(cnf)
+        consequent = self.consequent.tseitin(cnf)
+        x = cnf.variable()
+        cnf.clauses.append([-x, -antecedent, consequent])
+        cnf.clauses.append([x, antecedent])
+        cnf.clauses.append([x, -consequent])
+        return x
+
+
+class Biconditional(Sentence):
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
+        Sentence.validate(left)
+        Sentence.validate(right)
+        return super().__new__(cls, left, right)
+
+    def __repr__(self):
+        return f"Biconditional({self.left}, {self.right})"
+
+    def evaluate(self, model):
+        return ((self.left.evaluate(model)
+                 and self.right.evaluate(model))
+                or (not self.left.evaluate(model)
+                    and not self.right.evaluate(model)))
+
+    def evaluate_partial(self, model):
+        left = self.left.evaluate_partial(model)
+        if left is None:
+            return None
+        right = self.right.evaluate_partial(model)
+        if right is None:
+            return None
+        return left == right
+
+    def formula(self):
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
+        return f"{left} <=> {right}"
+
+    def code(self, index, vector=False):
+        left = self.left.code(index, vector)
+        right = self.right.code(index, vector)
+        return f"({left} == {right})"
+
+    def tseitin(self, cnf):
+        left = self.left.tseitin(cnf)
+        right = self.right.tseitin(cnf)
+        x = cnf.variable()
+        cnf.clauses.append([-x, -left, right])
+        cnf.clauses.append([-x, left, -right])
+        cnf.clauses.append([x, left, right])
+        cnf.clauses.append([x, -left, -right])
+        return x
+
+
+class Cardinality(Sentence):
+    """
+    Constraint on how many of its operands are true, which must be
+    between `low` and `high` inclusive.
+    """
+    __slots__ = ("k", "operands")
+
+    def __new__(cls, k, *operands):
+        for operand in operands:
+            Sentence.validate(operand)
+        return super().__new__(cls, k, *operands)
+
+    def setup(self, k, *operands):
+        object.__setattr__(self, "k", k)
+        object.__setattr__(self, "operands", operands)
+
+    def __repr__(self):
+        operands = ", ".join([str(operand) for operand in self.operands])
+        return f"{type(self).__name__}({self.k}, {operands})"
+
+    def children(self):
+        return self.operands
+
+    def bounds(self):
+        """Returns the lowest and highest allowed number of true operands."""
+        raise Exception("no bounds")
+
+    def evaluate(self, model):
+        low, high = self.bounds()
+        count = sum(operand.evaluate(model) for operand in self.operands)
+        return low <= count <= high
+
+    def evaluate_partial(self, model):
+        low, high = self.bounds()
+        true = unknown = 0
+        for operand in self.operands:
+            value = operand.evaluate_partial(model)
+            if value is None:
+                unknown += 1
+            elif value:
+                true += 1
+        if true > high or true + unknown < low:
+            return False
+        if true >= low and true + unknown <= high:
+            return True
+        return None
+
+    def formula(self):
+        operands = ", ".join([operand.formula() for operand in self.operands])
+        return f"{type(self).__name__}({self.k}, {operands})"
+
+    def code(self, index, vector=False):
+        low, high = self.bounds()
+        count = "(0" + "".join(
+            f" + 1 * {operand.code(index, vector)}" for operand in self.operands
+        ) + ")"
+        if not vector:
+            return f"({low} <= {count} <= {high})"
+        conditions = []
+        if low > 0:
+            conditions.append(f"({count} >= {low})")
+        if high < len(self.operands):
+            conditions.append(f"({count} <= {high})")
+        if not conditions:
+            return "True"
+        return "(" + " & ".join(conditions) + ")"
+
+    def tseitin(self, cnf):
+        literals = [operand.tseitin(cnf) for operand in self.operands]
+        return cnf.between(literals, *self.bounds())
+
+    def encode(self, cnf):
+        """Adds clauses asserting that the constraint holds, using a
+        sequential counter instead of a literal for the whole constraint."""
+        low, high = self.bounds()
+        literals = [operand.tseitin(cnf) for operand in self.operands]
+        cnf.at_least(literals, low)
+        cnf.at_most(literals, high)
+
+
+class AtMostK(Cardinality):
+    """At most `k` of the operands are true."""
+    __slots__ = ()
+
+    def bounds(self):
+        return 0, self.k
+
+
+class AtLeastK(Cardinality):
+    """At least `k` of the operands are true."""
+    __slots__ = ()
+
+    def bounds(self):
+        return self.k, len(self.operands)
+
+
+class ExactlyOne(Cardinality):
+    """Exactly one of the operands is true."""
+    __slots__ = ()
+
+    def __new__(cls, *operands):
+        return super().__new__(cls, 1, *operands)
+
+    def __reduce__(self):
+        return (type(self), self.operands)
+
+    def __repr__(self):
+        operands = ", ".join([str(operand) for operand in self.operands])
+        return f"ExactlyOne({operands})"
+
+    def formula(self):
+        operands = ", ".join([operand.formula() for operand in self.operands])
+        return f"ExactlyOne({operands})"
+
+    def bounds(self):
+        return 1, 1
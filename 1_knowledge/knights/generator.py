@@ -0,0 +1,136 @@
+"""
+Knights and knaves puzzles, described by what each character says
+"""
+
+import random
+import sys
+import time
+
+from logic import *
+
+CHARACTERS = 40
+
+
+class Puzzle():
+    """
+    Knights and knaves puzzle. Every character is either a knight,
+    who always tells the truth, or a knave, who always lies.
+    """
+
+    def __init__(self, *characters):
+        self.characters = list(characters)
+        self.statements = []
+
+    def knight(self, character):
+        """Returns the symbol for `character` being a knight."""
+        return Symbol(f"{character} is a Knight")
+
+    def knave(self, character):
+        """Returns the symbol for `character` being a knave."""
+        return Symbol(f"{character} is a Knave")
+
+    def claim(self, character, statement):
+        """Returns the sentence "`character` says `statement`",
+        which holds exactly when the character is a knight."""
+        return Biconditional(self.knight(character), statement)
+
+    def says(self, character, statement):
+        """Adds that `character` says `statement`."""
+        self.statements.append(self.claim(character, statement))
+
+    def says_one_of(self, character, *statements):
+        """Adds that `character` said one of `statements`,
+        without knowing which one."""
+        self.statements.append(Or(*[
+            self.claim(character, statement) for statement in statements
+        ]))
+
+    def knowledge(self):
+        """Returns the knowledge base for the puzzle. Each character is
+        exactly one of knight or knave, written as a single biconditional
+        instead of an Or plus a Not(And(...))."""
+        return And(
+            *[Biconditional(self.knave(character), Not(self.knight(character)))
+              for character in self.characters],
+            *self.statements
+        )
+
+    def solve(self):
+        """Returns a dict mapping each character to "Knight", "Knave",
+        or None if the puzzle does not decide it, using one SAT backbone
+        pass over the knowledge base. Returns None if the puzzle has
+        no solution."""
+        forced = sat_backbone(self.knowledge())
+        if forced is None:
+            return None
+        solution = dict()
+        for character in self.characters:
+            knight = forced.get(self.knight(character).name)
+            if knight is None:
+                solution[character] = None
+            else:
+                solution[character] = "Knight" if knight else "Knave"
+        return solution
+
+
+def random_puzzle(n, seed=None):
+    """
+    Returns a random puzzle with `n` characters, each saying one thing
+    about the others, and the roles the puzzle was generated from.
+    Raises ValueError if `n` is less than 2.
+    """
+    if n < 2:
+        raise ValueError("a puzzle needs at least 2 characters")
+    rng = random.Random(seed)
+    characters = [f"P{i}" for i in range(n)]
+    roles = {character: rng.choice(["Knight", "Knave"])
+             for character in characters}
+    puzzle = Puzzle(*characters)
+
+    # Truth values of every symbol under the hidden roles
+    model = dict()
+    for character in characters:
+        model[puzzle.knight(character).name] = roles[character] == "Knight"
+        model[puzzle.knave(character).name] = roles[character] == "Knave"
+
+    for character in characters:
+        first, second = rng.sample(characters, 2)
+        statement = rng.choice([
+            puzzle.knight(first),
+            puzzle.knave(first),
+            Biconditional(puzzle.knight(first), puzzle.knight(second)),
+            Or(puzzle.knave(first), puzzle.knave(second)),
+        ])
+
+        # Knights only say true things, knaves only false ones
+        if statement.evaluate(model) != (roles[character] == "Knight"):
+            statement = Not(statement)
+        puzzle.says(character, statement)
+
+    return puzzle, roles
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python generator.py [characters] [seed]")
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else CHARACTERS
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    if n < 2:
+        sys.exit("A puzzle needs at least 2 characters")
+
+    puzzle, roles = random_puzzle(n, seed)
+    start = time.perf_counter()
+    solution = puzzle.solve()
+    seconds = time.perf_counter() - start
+
+    solved = [character for character in puzzle.characters
+              if solution[character] is not None]
+    for character in solved:
+        print(f"    {character} is a {solution[character]}")
+    print(f"Solved {len(solved)} of {n} characters in {seconds:.3f}s")
+    if any(solution[character] != roles[character] for character in solved):
+        sys.exit("Solution disagrees with the generated roles")
+
+
+if __name__ == "__main__":
+    main()
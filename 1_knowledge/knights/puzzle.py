@@ -1,4 +1,5 @@
 from logic import *
+from generator import Puzzle
 
 AKnight = Symbol("A is a Knight")
 AKnave = Symbol("A is a Knave")
@@ -11,95 +12,54 @@ CKnave = Symbol("C is a Knave")
 
 # Puzzle 0
 # A says "I am both a knight and a knave."
-knowledge0 = And(
-    Or(AKnight, AKnave),
-    Not(And(AKnight, AKnave)),  # A can only be a knight or a knave
-
-    # A says "I am both a knight and a knave."
-    Implication(AKnight, And(AKnave, AKnight)),
-    Implication(AKnave, Not(And(AKnave, AKnight)))
-)
+puzzle0 = Puzzle("A")
+puzzle0.says("A", And(AKnight, AKnave))
+knowledge0 = puzzle0.knowledge()
 
 # Puzzle 1
 # A says "We are both knaves."
 # B says nothing.
-knowledge1 = And(
-    Or(AKnight, AKnave),
-    Not(And(AKnight, AKnave)),  # A can only be a knight or knave
-    Or(BKnight, BKnave),
-    Not(And(BKnight, BKnave)),  # B can only be a knight or knave
-    
-    # A says "We are both knaves."
-    Implication(AKnight, And(AKnave, BKnave)),
-    Implication(AKnave, Not(And(AKnave, BKnave)))
-)
+puzzle1 = Puzzle("A", "B")
+puzzle1.says("A", And(AKnave, BKnave))
+knowledge1 = puzzle1.knowledge()
 
 # Puzzle 2
 # A says "We are the same kind."
 # B says "We are of different kinds."
-knowledge2 = And(
-    Or(AKnight, AKnave),
-    Not(And(AKnight, AKnave)),  # A can only be a knight or knave
-    Or(BKnight, BKnave),
-    Not(And(BKnight, BKnave)),  # B can only be a knight or knave
-    
-    # A says "We are the same kind."
-    Implication(AKnight, Or(And(AKnight, AKnight), And(AKnave, BKnave))),
-    Implication(AKnave, Not(Or(And(AKnight, AKnight), And(AKnave, BKnave)))),
-    # B says "We are of different kinds."
-    Implication(BKnight, Or(And(AKnight, BKnave), And(AKnave, BKnight))),
-    Implication(BKnave, Not(Or(And(AKnight, BKnave), And(AKnave, BKnight))))
-
-
-   
-)
+puzzle2 = Puzzle("A", "B")
+puzzle2.says("A", Or(And(AKnight, BKnight), And(AKnave, BKnave)))
+puzzle2.says("B", Or(And(AKnight, BKnave), And(AKnave, BKnight)))
+knowledge2 = puzzle2.knowledge()
 
 # Puzzle 3
 # A says either "I am a knight." or "I am a knave.", but you don't know which.
 # B says "A said 'I am a knave'."
 # B says "C is a knave."
 # C says "A is a knight."
-knowledge3 = And(
-    Or(AKnight, AKnave),
-    Not(And(AKnight, AKnave)),  # A can only be a knight or knave
-    Or(BKnight, BKnave),
-    Not(And(BKnight, BKnave)),  # B can only be a knight or knave
-    Or(CKnight, CKnave),
-    Not(And(CKnight, CKnave)),  # C can only be a knight or knave
-    
-    # B says "A said 'I am a knave'."
-    Implication(BKnight, Not(AKnave)),
-    
-    # B says "C is a knave."
-    Implication(BKnight, CKnave),
-    Implication(BKnave, Not(CKnave)),
-
-    # C says "A is a knight."
-    Implication(CKnight, AKnight),
-    Implication(CKnave, Not(AKnight)),
-
-    # Implication(AKnave,Not(Or(AKnight,AKnave))),
-    # Implication(AKnight,Or(AKnight,AKnave))
-
-)
+puzzle3 = Puzzle("A", "B", "C")
+puzzle3.says_one_of("A", AKnight, AKnave)
+puzzle3.says("B", puzzle3.claim("A", AKnave))
+puzzle3.says("B", CKnave)
+puzzle3.says("C", AKnight)
+knowledge3 = puzzle3.knowledge()
 
 
 def main():
-    symbols = [AKnight, AKnave, BKnight, BKnave, CKnight, CKnave]
     puzzles = [
-        ("Puzzle 0", knowledge0),
-        ("Puzzle 1", knowledge1),
-        ("Puzzle 2", knowledge2),
-        ("Puzzle 3", knowledge3)
+        ("Puzzle 0", puzzle0),
+        ("Puzzle 1", puzzle1),
+        ("Puzzle 2", puzzle2),
+        ("Puzzle 3", puzzle3)
     ]
-    for puzzle, knowledge in puzzles:
-        print(puzzle)
-        if len(knowledge.conjuncts) == 0:
-            print("    Not yet implemented.")
-        else:
-            for symbol in symbols:
-                if model_check(knowledge, symbol):
-                    print(f"    {symbol}")
+    for name, puzzle in puzzles:
+        print(name)
+        solution = puzzle.solve()
+        if solution is None:
+            print("    No solution.")
+            continue
+        for character, role in solution.items():
+            if role is not None:
+                print(f"    {character} is a {role}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,126 @@
+"""
+Headless Minesweeper simulator and benchmark for MinesweeperAI
+"""
+
+import sys
+import time
+from multiprocessing import Pool
+
+from minesweeper import INFERENCE, Minesweeper, MinesweeperAI, np
+
+GAMES = 100
+HEIGHT = 16
+WIDTH = 16
+MINES = 40
+INFERENCE_METHOD = "subset"
+
+# Number of points of the game at which knowledge size is reported
+STAGES = 10
+
+
+def play(game):
+    """
+    Plays one game, given as a (seed, height, width, mines, inference)
+    tuple, and returns a dict of statistics: whether the AI won, the moves
+    made, the seconds spent in the whole game and in add_knowledge, and
+    the size of the knowledge base after every move.
+    """
+    seed, height, width, mines, inference = game
+    start = time.perf_counter()
+
+    # The AI gets its own seed, as generators with the same seed would
+    # have its first random move land on the board's first mine
+    board = Minesweeper(height=height, width=width, mines=mines, seed=seed)
+    ai = MinesweeperAI(height=height, width=width, mines=mines,
+                       inference=inference, seed=seed + 1)
+
+    stats = {"won": False, "moves": 0, "inference": 0, "sizes": []}
+    while True:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+        if move is None or board.is_mine(move):
+            break
+
+        # Tell the AI about every cell the move revealed
+        stats["moves"] += 1
+        inference = time.perf_counter()
+        for cell, nearby in board.reveal(move).items():
+            if cell not in ai.moves_made:
+                ai.add_knowledge(cell, nearby)
+        stats["inference"] += time.perf_counter() - inference
+        stats["sizes"].append(len(ai.knowledge))
+
+        if len(ai.moves_made) == height * width - mines:
+            stats["won"] = True
+            break
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def knowledge_over_time(results):
+    """
+    Returns the average size of the knowledge base at each of STAGES
+    evenly spaced points of the games, measured as a fraction of the
+    moves each game made.
+    """
+    totals = [0] * STAGES
+    counts = [0] * STAGES
+    for stats in results:
+        sizes = stats["sizes"]
+        for stage in range(STAGES):
+            if sizes:
+                totals[stage] += sizes[stage * len(sizes) // STAGES]
+                counts[stage] += 1
+    return [total / max(count, 1) for total, count in zip(totals, counts)]
+
+
+def main():
+    if len(sys.argv) not in [1, 2, 5, 6, 7]:
+        sys.exit("Usage: python benchmark.py "
+                 "[games [height width mines [inference [processes]]]]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else GAMES
+    height, width, mines = HEIGHT, WIDTH, MINES
+    if len(sys.argv) > 2:
+        height, width, mines = map(int, sys.argv[2:5])
+    inference = sys.argv[5] if len(sys.argv) > 5 else INFERENCE_METHOD
+    processes = int(sys.argv[6]) if len(sys.argv) > 6 else None
+    if mines >= height * width:
+        sys.exit("There must be fewer mines than cells")
+    if inference not in INFERENCE:
+        sys.exit(f"Unknown inference {inference}, choose from {', '.join(INFERENCE)}")
+    if inference == "linear" and np is None:
+        sys.exit("Linear inference requires numpy")
+
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        results = pool.map(
+            play, [(seed, height, width, mines, inference)
+                   for seed in range(games)]
+        )
+    seconds = time.perf_counter() - start
+
+    wins = sum(stats["won"] for stats in results)
+    moves = sum(stats["moves"] for stats in results)
+    played = sum(stats["seconds"] for stats in results)
+    inferring = sum(stats["inference"] for stats in results)
+    sizes = [size for stats in results for size in stats["sizes"]]
+
+    print(f"{games} games on a {height}x{width} board with {mines} mines, "
+          f"{inference} inference, in {seconds:.2f}s")
+    print(f"  win rate:           {wins / games:.1%}")
+    print(f"  moves per game:     {moves / games:.1f}")
+    print(f"  moves per second:   {moves / max(played, 1e-9):.0f}")
+    print(f"  inference ms/move:  {1000 * inferring / max(moves, 1):.3f}")
+    print(f"  knowledge size:     {sum(sizes) / max(len(sizes), 1):.1f} average, "
+          f"{max(sizes, default=0)} max")
+
+    print()
+    print("Average knowledge size through the game")
+    for stage, size in enumerate(knowledge_over_time(results)):
+        print(f"  {100 * stage // STAGES:>3}% of moves: {size:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,46 @@
 import itertools
 import random
+from collections import defaultdict, deque
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Ways MinesweeperAI can combine sentences: comparing pairs for subsets,
+# or Gaussian elimination over the matrix of all sentences
+INFERENCE = ["subset", "linear"]
+
+# Tolerance for floating point values in Gaussian elimination
+EPSILON = 1e-9
+
+
+def neighbor_counts(board):
+    """
+    Returns, as a list of rows, the number of mines around each cell of
+    `board`, a list of rows of booleans. With NumPy, this is a 2D
+    convolution with a 3x3 kernel of ones around a zero center, summing
+    eight shifted slices of the zero-padded board.
+    """
+    height, width = len(board), len(board[0])
+    if np is not None:
+        padded = np.pad(np.array(board, dtype=np.uint8), 1)
+        counts = np.zeros((height, width), dtype=np.uint8)
+        for di, dj in itertools.product(range(3), repeat=2):
+            if (di, dj) != (1, 1):
+                counts += padded[di:di + height, dj:dj + width]
+        return counts.tolist()
+
+    counts = [[0] * width for i in range(height)]
+    for i in range(height):
+        for j in range(width):
+            if board[i][j]:
+                for ni in range(max(i - 1, 0), min(i + 2, height)):
+                    for nj in range(max(j - 1, 0), min(j + 2, width)):
+                        if (ni, nj) != (i, j):
+                            counts[ni][nj] += 1
+    return counts
 
 
 class Minesweeper():
@@ -7,7 +48,7 @@ class Minesweeper():
     Minesweeper game representation
     """
 
-    def __init__(self, height=8, width=8, mines=8):
+    def __init__(self, height=8, width=8, mines=8, seed=None):
 
         # Set initial width, height, and number of mines
         self.height = height
@@ -15,20 +56,19 @@ class Minesweeper():
         self.mines = set()
 
         # Initialize an empty field with no mines
-        self.board = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                row.append(False)
-            self.board.append(row)
+        self.board = [[False] * width for i in range(height)]
+
+        # Add mines randomly, from a generator of its own so that
+        # a seed always gives the same board
+        self.random = random.Random(seed)
+        for cell in self.random.sample(range(height * width), mines):
+            i, j = divmod(cell, width)
+            self.mines.add((i, j))
+            self.board[i][j] = True
 
-        # Add mines randomly
-        while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
-            if not self.board[i][j]:
-                self.mines.add((i, j))
-                self.board[i][j] = True
+        # Count the mines around every cell once,
+        # so that nearby_mines is a lookup
+        self.counts = neighbor_counts(self.board)
 
         # At first, player has found no mines
         self.mines_found = set()
@@ -58,24 +98,28 @@ class Minesweeper():
         within one row and column of a given cell,
         not including the cell itself.
         """
+        i, j = cell
+        return self.counts[i][j]
 
-        # Keep count of nearby mines
-        count = 0
-
-        # Loop over all cells within one row and column
-        for i in range(cell[0] - 1, cell[0] + 2):
-            for j in range(cell[1] - 1, cell[1] + 2):
-
-                # Ignore the cell itself
-                if (i, j) == cell:
-                    continue
-
-                # Update count if cell in bounds and is mine
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    if self.board[i][j]:
-                        count += 1
-
-        return count
+    def reveal(self, cell):
+        """
+        Returns a dict mapping every cell revealed by clicking a safe cell
+        to its number of nearby mines. As in the usual game, clicking a
+        cell with no nearby mines also reveals all of its neighbors,
+        flooding through every connected cell with no nearby mines.
+        """
+        i, j = cell
+        revealed = {cell: self.counts[i][j]}
+        flood = [cell] if self.counts[i][j] == 0 else []
+        while flood:
+            i, j = flood.pop()
+            for ni in range(max(i - 1, 0), min(i + 2, self.height)):
+                for nj in range(max(j - 1, 0), min(j + 2, self.width)):
+                    if (ni, nj) not in revealed:
+                        revealed[(ni, nj)] = self.counts[ni][nj]
+                        if self.counts[ni][nj] == 0:
+                            flood.append((ni, nj))
+        return revealed
 
     def won(self):
         """
@@ -132,16 +176,213 @@ class Sentence():
         self.cells.discard(cell)
 
 
+def bits(mask):
+    """
+    Yields the index of every bit set in `mask`, lowest first.
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitSentence():
+    """
+    Sentence storing its cells as a bitmask, with cell (i, j)
+    as bit i * width + j - offset, so that subset tests and differences
+    between sentences are single integer operations. The offset keeps
+    masks small on large boards.
+    """
+
+    def __init__(self, cells, count, width=8):
+        self.width = width
+        self.offset = min((i * width + j for i, j in cells), default=0)
+        self.mask = 0
+        for i, j in cells:
+            self.mask |= 1 << (i * width + j - self.offset)
+        self.count = count
+
+    @property
+    def cells(self):
+        return {divmod(bit, self.width) for bit in self.bits()}
+
+    def __eq__(self, other):
+        return self.cells == other.cells and self.count == other.count
+
+    def __str__(self):
+        return f"{self.cells} = {self.count}"
+
+    def bits(self):
+        """
+        Yields the board index i * width + j of every cell.
+        """
+        for bit in bits(self.mask):
+            yield bit + self.offset
+
+    def relative(self, other):
+        """
+        Returns the mask of `other`, whose cells must all come at or
+        after this sentence's offset, shifted to this sentence's offset.
+        """
+        if other.offset >= self.offset:
+            return other.mask << (other.offset - self.offset)
+        return other.mask >> (self.offset - other.offset)
+
+    def normalize(self):
+        """
+        Moves the offset to the first cell of the sentence.
+        """
+        if self.mask:
+            low = (self.mask & -self.mask).bit_length() - 1
+            self.mask >>= low
+            self.offset += low
+
+    def known_mines(self):
+        """
+        Returns the set of all cells in self.cells known to be mines.
+        """
+        if self.mask.bit_count() == self.count:
+            return self.cells
+        return None
+
+    def known_safes(self):
+        """
+        Returns the set of all cells in self.cells known to be safe.
+        """
+        if self.count == 0:
+            return self.cells
+
+    def mark_mine(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be a mine.
+        """
+        bit = cell[0] * self.width + cell[1] - self.offset
+        if bit >= 0 and self.mask >> bit & 1:
+            self.mask ^= 1 << bit
+            self.count -= 1
+
+    def mark_safe(self, cell):
+        """
+        Updates internal knowledge representation given the fact that
+        a cell is known to be safe.
+        """
+        bit = cell[0] * self.width + cell[1] - self.offset
+        if bit >= 0:
+            self.mask &= ~(1 << bit)
+
+
+def convolve(a, b):
+    """
+    Returns the product of two polynomials given as coefficient lists.
+    """
+    product = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+    return product
+
+
+def count_configurations(sentences):
+    """
+    Counts the ways to place mines in the cells of `sentences`, which
+    are (mask, count) pairs, consistent with every sentence. Returns
+    `cells`, `counts` and `hits`, where cells lists the bit of every
+    cell, counts[m] is the number of configurations with m mines and
+    hits[i][m] the number of those in which cells[i] is a mine.
+    """
+    # Visit cells sentence by sentence, so that each sentence
+    # is complete soon after its first cell is assigned
+    cells = []
+    seen = 0
+    for mask, count in sentences:
+        for bit in bits(mask & ~seen):
+            cells.append(bit)
+        seen |= mask
+
+    position = {bit: i for i, bit in enumerate(cells)}
+    members = [[] for cell in cells]
+    need = []
+    left = []
+    for k, (mask, count) in enumerate(sentences):
+        need.append(count)
+        left.append(mask.bit_count())
+        for bit in bits(mask):
+            members[position[bit]].append(k)
+
+    # Sentences with cells both before and from each position: the rest
+    # of the search only depends on how many mines they still need
+    spans = [(min(position[bit] for bit in bits(mask)),
+              max(position[bit] for bit in bits(mask)))
+             for mask, count in sentences]
+    open_sentences = [
+        [k for k, (first, last) in enumerate(spans) if first < i <= last]
+        for i in range(len(cells))
+    ]
+    memo = {}
+
+    def backtrack(i):
+        """Returns counts and hits for cells[i:], given the mines
+        already placed before i."""
+        if i == len(cells):
+            return [1], []
+        key = (i, tuple(need[k] for k in open_sentences[i]))
+        if key in memo:
+            return memo[key]
+
+        counts = [0] * (len(cells) - i + 1)
+        hits = [[0] * len(counts) for j in range(i, len(cells))]
+        for mine in (0, 1):
+            consistent = True
+            for k in members[i]:
+                left[k] -= 1
+                need[k] -= mine
+                if need[k] < 0 or need[k] > left[k]:
+                    consistent = False
+            if consistent:
+                rest_counts, rest_hits = backtrack(i + 1)
+                for m, n in enumerate(rest_counts):
+                    counts[m + mine] += n
+                    if mine:
+                        hits[0][m + 1] += n
+                for j, poly in enumerate(rest_hits):
+                    for m, n in enumerate(poly):
+                        hits[j + 1][m + mine] += n
+            for k in members[i]:
+                left[k] += 1
+                need[k] += mine
+
+        memo[key] = counts, hits
+        return counts, hits
+
+    counts, hits = backtrack(0)
+    return cells, counts, hits
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None, inference="subset",
+                 seed=None):
 
-        # Set initial height and width
+        # Set initial height and width, and the number of mines if known
         self.height = height
         self.width = width
+        self.total_mines = mines
+
+        # Random moves come from a generator of its own, so that
+        # a seed always gives the same moves on the same board
+        self.random = random.Random(seed)
+
+        # Set how sentences are combined to infer new knowledge
+        if inference not in INFERENCE:
+            raise ValueError(f"inference must be one of {', '.join(INFERENCE)}")
+        if inference == "linear" and np is None:
+            raise ImportError("linear inference requires numpy")
+        self.inference = inference
 
         # Keep track of which cells have been clicked on
         self.moves_made = set()
@@ -150,26 +391,98 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Safe cells in the order they were found, some maybe played since
+        self.safe_moves = []
+
+        # Sentences about the game known to be true, keyed by id(sentence)
+        self.knowledge = {}
+
+        # Sentences containing each cell bit, keyed by id(sentence)
+        self.index = defaultdict(dict)
+
+        # Sentences changed since they were last compared with others
+        self.dirty = deque()
+        self.queued = set()
+
+        # Sentence for each (cells, count) seen, to drop duplicates
+        self.signatures = {}
+        self.signed = {}
+
+        # Mine configurations counted for each component of the
+        # frontier, kept while the component does not change
+        self.configurations = {}
+
+        # Number of inferences of each kind made so far
+        self.inferences = {
+            "subset": 0, "linear": 0, "mine": 0, "safe": 0, "duplicate": 0,
+            "empty": 0
+        }
 
     def mark_mine(self, cell):
         """
         Marks a cell as a mine, and updates all knowledge
         to mark that cell as a mine as well.
         """
+        bit = self.bit(cell)
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+
+        # Same as sentence.mark_mine(cell), on sentences known to hold it
+        for sentence in self.index.pop(bit, {}).values():
+            sentence.mask ^= 1 << (bit - sentence.offset)
+            sentence.count -= 1
+            self.queue(sentence)
 
     def mark_safe(self, cell):
         """
         Marks a cell as safe, and updates all knowledge
         to mark that cell as safe as well.
         """
+        bit = self.bit(cell)
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        if cell not in self.moves_made:
+            self.safe_moves.append(cell)
+
+        # Same as sentence.mark_safe(cell), on sentences known to hold it
+        for sentence in self.index.pop(bit, {}).values():
+            sentence.mask ^= 1 << (bit - sentence.offset)
+            self.queue(sentence)
+
+    def add_sentence(self, sentence):
+        """
+        Adds a sentence to the knowledge base and to the index
+        of every cell in it.
+        """
+        self.knowledge[id(sentence)] = sentence
+        for bit in sentence.bits():
+            self.index[bit][id(sentence)] = sentence
+        self.queue(sentence)
+
+    def remove_sentence(self, sentence):
+        """
+        Removes a sentence from the knowledge base and the index.
+        """
+        del self.knowledge[id(sentence)]
+        for bit in sentence.bits():
+            del self.index[bit][id(sentence)]
+        self.unsign(sentence)
+
+    def unsign(self, sentence):
+        """
+        Forgets the signature of a sentence that changed or was removed.
+        """
+        signature = self.signed.pop(id(sentence), None)
+        if signature is not None:
+            del self.signatures[signature]
+
+    def queue(self, sentence):
+        """
+        Queues a changed sentence to be compared with the
+        sentences it shares cells with.
+        """
+        self.unsign(sentence)
+        if id(sentence) not in self.queued:
+            self.queued.add(id(sentence))
+            self.dirty.append(sentence)
 
     def add_knowledge(self, cell, count):
         """
@@ -194,47 +507,170 @@ class MinesweeperAI():
         self.mark_safe(cell)
 
         # 3) add a new sentence to the AI's knowledge base    
-        #    based on the value of `cell` and `count`
-        cells = self.neighbor_cells(cell)
+        #    based on the value of `cell` and `count`,
+        #    leaving out neighbors already known to be safe or mines
+        cells = self.neighbor_cells(cell) - self.safes
+        count -= len(cells & self.mines)
+        cells -= self.mines
         if len(cells) > 0:
-            self.knowledge.append(Sentence(cells, count))
+            self.add_sentence(BitSentence(cells, count, self.width))
 
         # 4) mark any additional cells as safe or as mines
         #    if it can be concluded based on the AI's knowledge base
+        # 5) add any new sentences to the AI's knowledge base
+        #    if they can be inferred from existing knowledge
+        self.update_ai()
 
-        loop_ai = True
-        while loop_ai:
-            loop_ai = self.update_ai()
- 
-    def update_ai(self):
-        for k, sentence in enumerate(self.knowledge):
-            for k0 in range(k, len(self.knowledge)):
-                if k == k0:
+        # Elimination is only worth running once the cheaper
+        # inferences have run out of safe moves
+        if self.inference == "linear":
+            while self.make_safe_move() is None and self.update_linear():
+                self.update_ai()
+
+    def update_linear(self):
+        """
+        Marks every cell that Gaussian elimination over the knowledge
+        shows to be a mine or safe. Returns True if any cell was marked.
+        """
+        mines, safes = self.linear_inference()
+        for cell in mines:
+            self.mark_mine(cell)
+        for cell in safes:
+            self.mark_safe(cell)
+        self.inferences["linear"] += len(mines) + len(safes)
+        return bool(mines or safes)
+
+    def linear_inference(self):
+        """
+        Returns the sets of cells known to be mines and known to be safe,
+        found by reducing the 0/1 matrix of each component's sentences to
+        row echelon form. Each reduced row says that a weighted sum of
+        cells, each 0 or 1, equals a count; if the count is the least or
+        greatest value that sum can take, every cell in the row is known.
+        """
+        mines = set()
+        safes = set()
+        for mask, sentences in self.components():
+            cells = list(bits(mask))
+            column = {bit: j for j, bit in enumerate(cells)}
+
+            # One row per sentence, with its count in the last column
+            matrix = np.zeros((len(sentences), len(cells) + 1))
+            for i, (sentence_mask, count) in enumerate(sentences):
+                matrix[i, [column[bit] for bit in bits(sentence_mask)]] = 1
+                matrix[i, -1] = count
+
+            row = 0
+            for j in range(len(cells)):
+                pivot = row + np.argmax(np.abs(matrix[row:, j]))
+                if abs(matrix[pivot, j]) < EPSILON:
                     continue
-                
-                set1 = sentence
-                set2 = self.knowledge[k0]
+                matrix[[row, pivot]] = matrix[[pivot, row]]
+                matrix[row] /= matrix[row, j]
+                factors = matrix[:, j].copy()
+                factors[row] = 0
+                matrix -= np.outer(factors, matrix[row])
+                row += 1
+                if row == len(sentences):
+                    break
+            matrix[np.abs(matrix) < EPSILON] = 0
+
+            # Bounds of each row's sum over all 0/1 assignments
+            coefficients = matrix[:, :-1]
+            counts = matrix[:, -1]
+            positive = coefficients > 0
+            negative = coefficients < 0
+            low = np.where(negative, coefficients, 0).sum(axis=1)
+            high = np.where(positive, coefficients, 0).sum(axis=1)
+            at_low = (np.abs(counts - low) < EPSILON)[:, None]
+            at_high = (np.abs(counts - high) < EPSILON)[:, None]
+
+            mine = ((at_low & negative) | (at_high & positive)).any(axis=0)
+            safe = ((at_low & positive) | (at_high & negative)).any(axis=0)
+            mines.update(divmod(cells[j], self.width) for j in np.flatnonzero(mine))
+            safes.update(divmod(cells[j], self.width) for j in np.flatnonzero(safe))
+        return mines, safes
 
-                if len(set1.cells) == 0 or len(set2.cells) == 0:
+    def update_ai(self):
+        """
+        Processes queued sentences until none is left. Each one is
+        dropped if empty or a duplicate, has its cells marked if they
+        are all mines or all safe, and is otherwise compared with the
+        sentences that share a cell with it when using subset inference.
+        Returns True if any inference was made.
+        """
+        updated = False
+        while self.dirty:
+            sentence = self.dirty.popleft()
+            self.queued.discard(id(sentence))
+            if id(sentence) not in self.knowledge:
+                continue
+
+            if sentence.mask == 0:
+                self.remove_sentence(sentence)
+                self.inferences["empty"] += 1
+                continue
+
+            # Same tests as known_mines and known_safes,
+            # without building the set of cells
+            mines = sentence.mask.bit_count() == sentence.count
+            if mines or sentence.count == 0:
+                for bit in list(sentence.bits()):
+                    cell = divmod(bit, self.width)
+                    if mines:
+                        self.mark_mine(cell)
+                        self.inferences["mine"] += 1
+                    else:
+                        self.mark_safe(cell)
+                        self.inferences["safe"] += 1
+                self.remove_sentence(sentence)
+                updated = True
+                continue
+
+            sentence.normalize()
+            signature = (sentence.offset, sentence.mask, sentence.count)
+            if signature in self.signatures:
+                self.remove_sentence(sentence)
+                self.inferences["duplicate"] += 1
+                continue
+            self.signatures[signature] = sentence
+            self.signed[id(sentence)] = signature
+            if self.inference != "subset":
+                continue
+
+            # Only sentences sharing a cell can be subsets of each other
+            others = {}
+            for bit in sentence.bits():
+                others.update(self.index[bit])
+            others.pop(id(sentence), None)
+
+            for other in others.values():
+                if sentence.mask == 0 or other.mask == 0:
                     continue
-                
-                if(set1.cells <= set2.cells):
-                    self.subset(set1, set2)
-                    return True
-                 
-                if(set1.cells >= set2.cells):
-                    self.subset(set2, set1)
-                    return True
-        return False
-   
+                other.normalize()
+
+                # A subset's first cell is at or after its superset's
+                if (sentence.offset >= other.offset
+                        and other.relative(sentence) & ~other.mask == 0):
+                    self.subset(sentence, other)
+                    updated = True
+                elif (other.offset >= sentence.offset
+                        and sentence.relative(other) & ~sentence.mask == 0):
+                    self.subset(other, sentence)
+                    updated = True
+        return updated
+
     def subset(self, set1, set2):
         """ 
         Updates the 'cells' and 'count' of set2, removing this subset set1
         """
-        for cell in set1.cells:
-            set2.cells.remove(cell)
-            
+        for bit in set1.bits():
+            del self.index[bit][id(set2)]
+
+        set2.mask &= ~set2.relative(set1)
         set2.count -= set1.count
+        self.queue(set2)
+        self.inferences["subset"] += 1
 
     def make_safe_move(self):
         """
@@ -245,13 +681,11 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        for sentence in self.knowledge:
-            cells = sentence.known_safes()
-            
-            while cells:
-                cell = cells.pop()
-                if cell not in self.mines and cell not in self.moves_made:
-                    return cell
+        # Drop safe cells played since they were found
+        while self.safe_moves and self.safe_moves[-1] in self.moves_made:
+            self.safe_moves.pop()
+        if self.safe_moves:
+            return self.safe_moves[-1]
         return None
 
     def make_random_move(self):
@@ -260,12 +694,181 @@ class MinesweeperAI():
         Should choose randomly among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        If the number of mines is known, chooses randomly among the
+        cells least likely to be mines. Returns None if no cell is left.
+        """
+        if len(self.moves_made) + len(self.mines) == self.height * self.width:
+            return None
+
+        risk = None
+        if self.total_mines is not None:
+            risk = self.frontier_probabilities()
+        if risk is None:
+            return self.random_cell()
+
+        frontier, outside = risk
+        lowest = min(frontier.values(), default=outside)
+        if outside is not None and outside < lowest:
+            return self.random_cell(frontier)
+        cells = [cell for cell, p in frontier.items() if p == lowest]
+        if outside == lowest:
+            # Pick from all equally risky cells, in or out of the frontier
+            unknown = self.height * self.width - len(self.moves_made) - len(self.mines)
+            outside_count = unknown - len(frontier)
+            if self.random.randrange(len(cells) + outside_count) >= len(cells):
+                return self.random_cell(frontier)
+        return self.random.choice(cells)
+
+    def random_cell(self, excluded=()):
+        """
+        Returns a random cell that has not been played, is not known to
+        be a mine and is not in `excluded`, by sampling cells until one
+        fits while that is likely to be quick.
+        """
+        size = self.height * self.width
+        left = size - len(self.moves_made) - len(self.mines) - len(excluded)
+        if 8 * left >= size:
+            while True:
+                cell = divmod(self.random.randrange(size), self.width)
+                if (cell not in self.moves_made and cell not in self.mines
+                        and cell not in excluded):
+                    return cell
+        return self.random.choice([
+            (i, j) for i in range(self.height) for j in range(self.width)
+            if (i, j) not in self.moves_made and (i, j) not in self.mines
+            and (i, j) not in excluded
+        ])
+
+    def components(self):
+        """
+        Splits the knowledge into groups of sentences that share cells,
+        and returns a list of (cells mask, sentences) pairs.
+        """
+        parent = {}
+
+        def find(bit):
+            while parent[bit] != bit:
+                parent[bit] = parent[parent[bit]]
+                bit = parent[bit]
+            return bit
+
+        for sentence in self.knowledge.values():
+            first = None
+            for bit in sentence.bits():
+                parent.setdefault(bit, bit)
+                if first is None:
+                    first = find(bit)
+                else:
+                    parent[find(bit)] = first
+
+        groups = defaultdict(lambda: [0, []])
+        for sentence in self.knowledge.values():
+            if sentence.mask:
+                mask = sentence.mask << sentence.offset
+                group = groups[find(mask.bit_length() - 1)]
+                group[0] |= mask
+                group[1].append((mask, sentence.count))
+        return [tuple(group) for group in groups.values()]
+
+    def mine_probabilities(self):
+        """
+        Returns a dict mapping every cell not yet played or known to be
+        a mine to the probability that it is a mine, given the knowledge
+        and the total number of mines. Returns None if the knowledge
+        allows no placement of the mines.
+        """
+        risk = self.frontier_probabilities()
+        if risk is None:
+            return None
+        probabilities, outside = risk
+        if outside is not None:
+            for i in range(self.height):
+                for j in range(self.width):
+                    cell = (i, j)
+                    if (cell not in probabilities and cell not in self.moves_made
+                            and cell not in self.mines):
+                        probabilities[cell] = outside
+        return probabilities
+
+    def frontier_probabilities(self):
+        """
+        Returns a dict mapping every cell in a sentence to the probability
+        that it is a mine, and the probability shared by every other cell
+        not yet played or known to be a mine, or None if there is no such
+        cell. Each component of the frontier is solved on its own, and the
+        cells outside every sentence share the remaining mines.
+        Returns None if the knowledge allows no placement of the mines.
+        """
+        remaining = self.total_mines - len(self.mines)
+        frontier = 0
+        solved = []
+        configurations = {}
+        for mask, sentences in self.components():
+            frontier |= mask
+            key = tuple(sorted(sentences))
+            if key not in self.configurations:
+                self.configurations[key] = count_configurations(key)
+            configurations[key] = self.configurations[key]
+            solved.append(configurations[key])
+
+        # Only keep the components still on the frontier
+        self.configurations = configurations
+
+        unknown = self.height * self.width - len(self.moves_made) - len(self.mines)
+        outside = unknown - frontier.bit_count()
+
+        # Ways to place the other mines outside the frontier, relative to
+        # the fewest that can be outside, as comb(outside, rest) would be
+        # huge on large boards
+        fewest = max(remaining - frontier.bit_count(), 0)
+        ratios = {}
+        ratio = Fraction(1)
+        for rest in range(fewest, min(remaining, outside) + 1):
+            ratios[rest] = ratio
+            ratio *= Fraction(outside - rest, rest + 1)
+
+        def weight(frontier_mines, mine=False):
+            """Ways to place the other mines outside the frontier,
+            with a given cell outside it being a mine if `mine`."""
+            rest = remaining - frontier_mines
+            if rest not in ratios:
+                return 0
+            if mine:
+                return ratios[rest] * Fraction(rest, outside)
+            return ratios[rest]
+
+        total = [1]
+        for cells, counts, hits in solved:
+            total = convolve(total, counts)
+        ways = sum(n * weight(m) for m, n in enumerate(total))
+        if ways == 0:
+            return None
+
+        probabilities = {}
+        for k, (cells, counts, hits) in enumerate(solved):
+            others = [1]
+            for j, (_, other_counts, _) in enumerate(solved):
+                if j != k:
+                    others = convolve(others, other_counts)
+            factors = [
+                sum(n * weight(m + rest) for rest, n in enumerate(others))
+                for m in range(len(counts))
+            ]
+            for i, bit in enumerate(cells):
+                mine_ways = sum(hits[i][m] * factor
+                                for m, factor in enumerate(factors))
+                probabilities[divmod(bit, self.width)] = mine_ways / ways
+
+        if outside == 0:
+            return probabilities, None
+        mine_ways = sum(n * weight(m, mine=True) for m, n in enumerate(total))
+        return probabilities, mine_ways / ways
+
+    def bit(self, cell):
+        """
+        Returns the board index of cell, as used by BitSentence
         """
-        while True:
-            i = random.randrange(self.height)
-            j = random.randrange(self.width)
-            if (i, j) not in self.moves_made and (i, j) not in self.mines:
-                return (i, j)
+        return cell[0] * self.width + cell[1]
 
     def neighbor_cells(self, cell):
         """
@@ -0,0 +1,175 @@
+"""
+Records seeded Minesweeper games to replay logs, and replays them
+headless to time or profile any single move
+
+Usage: python replay.py record log.json [height width mines [seed [inference]]]
+       python replay.py replay log.json [move]
+"""
+
+import cProfile
+import json
+import pstats
+import sys
+import time
+
+from minesweeper import INFERENCE, Minesweeper, MinesweeperAI, np
+
+HEIGHT = 16
+WIDTH = 16
+MINES = 40
+SEED = 0
+INFERENCE_METHOD = "subset"
+
+# Number of slowest moves printed
+SLOWEST = 5
+
+
+def new_game(log):
+    """
+    Returns the board and AI for the game a replay log describes.
+    """
+    board = Minesweeper(height=log["height"], width=log["width"],
+                        mines=log["mines"], seed=log["seed"])
+    ai = MinesweeperAI(height=log["height"], width=log["width"],
+                       mines=log["mines"], inference=log["inference"],
+                       seed=log["ai_seed"])
+    return board, ai
+
+
+def turn(board, ai):
+    """
+    Makes one AI move and tells the AI about every cell it revealed.
+    Returns the move, whether it was a random move, and whether it
+    hit a mine, or None if no move was left.
+    """
+    guess = False
+    move = ai.make_safe_move()
+    if move is None:
+        guess = True
+        move = ai.make_random_move()
+    if move is None:
+        return None
+    if board.is_mine(move):
+        return move, guess, True
+    for cell, nearby in board.reveal(move).items():
+        if cell not in ai.moves_made:
+            ai.add_knowledge(cell, nearby)
+    return move, guess, False
+
+
+def record(height, width, mines, seed, inference=INFERENCE_METHOD):
+    """
+    Plays a seeded game and returns its replay log: the game settings,
+    and for every move the cell, whether it was a random move, the
+    seconds it took and the number of inferences it made.
+    """
+    # The AI gets its own seed, as generators with the same seed would
+    # have its first random move land on the board's first mine
+    log = {
+        "height": height, "width": width, "mines": mines, "seed": seed,
+        "ai_seed": seed + 1, "inference": inference, "moves": [],
+        "won": False
+    }
+    board, ai = new_game(log)
+    while True:
+        inferences = sum(ai.inferences.values())
+        start = time.perf_counter()
+        result = turn(board, ai)
+        seconds = time.perf_counter() - start
+        if result is None:
+            break
+        (i, j), guess, lost = result
+        log["moves"].append([
+            i, j, int(guess), round(seconds, 6),
+            sum(ai.inferences.values()) - inferences
+        ])
+        if lost:
+            break
+        if len(ai.moves_made) == height * width - mines:
+            log["won"] = True
+            break
+    return log
+
+
+def replay(log, profile=None):
+    """
+    Replays the moves of a replay log, checking that the AI makes the
+    same moves, and returns the seconds each move took. The move
+    numbered `profile`, counting from 0, is run under cProfile.
+    """
+    board, ai = new_game(log)
+    seconds = []
+    for number, (i, j, guess, _, _) in enumerate(log["moves"]):
+        profiler = cProfile.Profile() if number == profile else None
+        start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        result = turn(board, ai)
+        if profiler is not None:
+            profiler.disable()
+        seconds.append(time.perf_counter() - start)
+
+        if result is None or result[0] != (i, j):
+            raise ValueError(f"replay diverged from the log at move {number}")
+        if profiler is not None:
+            print(f"Profile of move {number} at {(i, j)}")
+            pstats.Stats(profiler).sort_stats("cumulative").print_stats(15)
+    return seconds
+
+
+def print_slowest(log, seconds):
+    """
+    Prints the slowest moves of a game.
+    """
+    print(f"{len(log['moves'])} moves on a {log['height']}x{log['width']} "
+          f"board with {log['mines']} mines, seed {log['seed']}: "
+          f"{'won' if log['won'] else 'lost'} in {sum(seconds):.3f}s")
+    slowest = sorted(range(len(seconds)), key=lambda k: -seconds[k])
+    for number in slowest[:SLOWEST]:
+        i, j, guess, _, inferences = log["moves"][number]
+        kind = "random" if guess else "safe"
+        print(f"  move {number:>5} {kind:>6} at {(i, j)}: "
+              f"{1000 * seconds[number]:.3f}ms, {inferences} inferences")
+
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ["record", "replay"]:
+        sys.exit(__doc__.split("\n\n")[-1].strip())
+    command, path = sys.argv[1:3]
+
+    if command == "record":
+        if len(sys.argv) not in [3, 6, 7, 8]:
+            sys.exit("Usage: python replay.py record log.json "
+                     "[height width mines [seed [inference]]]")
+        height, width, mines = HEIGHT, WIDTH, MINES
+        if len(sys.argv) > 3:
+            height, width, mines = map(int, sys.argv[3:6])
+        seed = int(sys.argv[6]) if len(sys.argv) > 6 else SEED
+        inference = sys.argv[7] if len(sys.argv) > 7 else INFERENCE_METHOD
+        if inference not in INFERENCE:
+            sys.exit(f"Unknown inference {inference}, choose from {', '.join(INFERENCE)}")
+        if inference == "linear" and np is None:
+            sys.exit("Linear inference requires numpy")
+
+        log = record(height, width, mines, seed, inference)
+        with open(path, "w") as f:
+            json.dump(log, f, separators=(",", ":"))
+        print_slowest(log, [move[3] for move in log["moves"]])
+        return
+
+    if len(sys.argv) > 4:
+        sys.exit("Usage: python replay.py replay log.json [move]")
+    with open(path) as f:
+        log = json.load(f)
+    profile = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    if profile is not None and not 0 <= profile < len(log["moves"]):
+        sys.exit(f"The log only has moves 0 to {len(log['moves']) - 1}")
+    try:
+        seconds = replay(log, profile)
+    except ValueError as e:
+        sys.exit(str(e))
+    print_slowest(log, seconds)
+
+
+if __name__ == "__main__":
+    main()
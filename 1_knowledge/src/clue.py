@@ -21,15 +21,20 @@ symbols = characters + rooms + weapons
 
 
 def check_knowledge(knowledge):
+    forced = knowledge.backbone()
+
+    # A knowledge base with no models entails every symbol
+    if forced is None:
+        forced = {symbol.name: True for symbol in symbols}
     for symbol in symbols:
-        if model_check(knowledge, symbol):
+        if forced.get(symbol.name) is True:
             termcolor.cprint(f"{symbol}: YES", "green")
-        elif not model_check(knowledge, Not(symbol)):
+        elif symbol.name not in forced:
             print(f"{symbol}: MAYBE")
 
 
 # There must be a person, room, and weapon.
-knowledge = And(
+knowledge = KnowledgeBase(
     Or(mustard, plum, scarlet),
     Or(ballroom, kitchen, library),
     Or(knife, revolver, wrench)
@@ -6,34 +6,15 @@ for i in range(4):
     for color in colors:
         symbols.append(Symbol(f"{color}{i}"))
 
-knowledge = And()
+knowledge = KnowledgeBase()
 
-# Each color has a position.
+# Each color has exactly one position.
 for color in colors:
-    knowledge.add(Or(
-        Symbol(f"{color}0"),
-        Symbol(f"{color}1"),
-        Symbol(f"{color}2"),
-        Symbol(f"{color}3")
-    ))
-
-# Only one position per color.
-for color in colors:
-    for i in range(4):
-        for j in range(4):
-            if i != j:
-                knowledge.add(Implication(
-                    Symbol(f"{color}{i}"), Not(Symbol(f"{color}{j}"))
-                ))
+    knowledge.add(ExactlyOne(*[Symbol(f"{color}{i}") for i in range(4)]))
 
 # Only one color per position.
 for i in range(4):
-    for c1 in colors:
-        for c2 in colors:
-            if c1 != c2:
-                knowledge.add(Implication(
-                    Symbol(f"{c1}{i}"), Not(Symbol(f"{c2}{i}"))
-                ))
+    knowledge.add(AtMostK(1, *[Symbol(f"{color}{i}") for color in colors]))
 
 knowledge.add(Or(
     And(Symbol("red0"), Symbol("blue1"), Not(Symbol("green2")), Not(Symbol("yellow3"))),
@@ -51,6 +32,11 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
+forced = knowledge.backbone()
+
+# A knowledge base with no models entails every symbol
+if forced is None:
+    forced = {symbol.name: True for symbol in symbols}
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if forced.get(symbol.name) is True:
         print(symbol)
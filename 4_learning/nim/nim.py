@@ -1,6 +1,17 @@
 import math
 import random
 import time
+from array import array
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Fewest actions in a state for NimAI to compare their Q-values with
+# NumPy; below this, a Python loop over the few values is faster
+VECTOR_ACTIONS = 40
 
 
 class Nim():
@@ -72,20 +83,64 @@ class Nim():
 
 class NimAI():
 
-    def __init__(self, alpha=0.5, epsilon=0.1):
+    def __init__(self, alpha=0.5, epsilon=0.1, initial=[1, 3, 5, 7]):
         """
-        Initialize AI with an empty Q-learning dictionary,
+        Initialize AI with a Q-learning table of zeros,
         an alpha (learning) rate, and an epsilon rate.
 
-        The Q-learning dictionary maps `(state, action)`
-        pairs to a Q-value (a number).
-         - `state` is a tuple of remaining piles, e.g. (1, 1, 4, 4)
+        The Q-learning table holds a Q-value (a number) for every
+        `(state, action)` pair of a game starting from `initial` piles.
+         - `state` is a list of remaining piles, e.g. [1, 1, 4, 4]
          - `action` is a tuple `(i, j)` for an action
+
+        States are numbered in mixed radix, with pile i as a digit in
+        base initial[i] + 1, and actions (i, j) are numbered pile by
+        pile. The table is a flat array of floats holding one row of
+        actions for each state seen so far, appended the first time the
+        state is seen, so memory grows with the states visited rather
+        than with every possible state.
         """
-        self.q = dict()
+        self.initial = list(initial)
+        self.strides = []
+        self.offsets = []
+        states = 1
+        actions = 0
+        for pile in self.initial:
+            self.strides.append(states)
+            self.offsets.append(actions)
+            states *= pile + 1
+            actions += pile
+        self.actions = actions
+        self.q = array("d")
         self.alpha = alpha
         self.epsilon = epsilon
 
+        # For each state seen, by number: the start of its row in
+        # `self.q`, its available actions and their columns in the row
+        self.state_moves = dict()
+
+    def row(self, state):
+        """
+        Return the number of the state `state`. Raise ValueError if
+        the state cannot be reached from the initial piles.
+        """
+        if len(state) != len(self.initial) or any(
+            pile < 0 or pile > initial
+            for pile, initial in zip(state, self.initial)
+        ):
+            raise ValueError(
+                f"state {state} does not fit initial piles {self.initial}"
+            )
+        return sum(map(mul, state, self.strides))
+
+    def index(self, state, action):
+        """
+        Return the position in `self.q` of the state `state`
+        and the action `action`.
+        """
+        i, j = action
+        return self.moves(state)[0] + self.offsets[i] + j - 1
+
     def update(self, old_state, action, new_state, reward):
         """
         Update Q-learning model, given an old state, an action taken
@@ -99,11 +154,14 @@ class NimAI():
     def get_q_value(self, state, action):
         """
         Return the Q-value for the state `state` and the action `action`.
-        If no Q-value exists yet in `self.q`, return 0.
+        Q-values not learned yet are 0.
         """
-        
-        return self.q.get((tuple(state), action), 0)
-        
+        row = self.row(state)
+        if row not in self.state_moves:
+            return 0
+        i, j = action
+        return self.q[self.state_moves[row][0] + self.offsets[i] + j - 1]
+
     def update_q_value(self, state, action, old_q, reward, future_rewards):
         """
         Update the Q-value for the state `state` and the action `action`
@@ -119,9 +177,46 @@ class NimAI():
         `alpha` is the learning rate, and `new value estimate`
         is the sum of the current reward and estimated future rewards.
         """
-        s_a = (tuple(state), action)
-        self.q[s_a] = old_q + self.alpha * (reward + future_rewards - old_q)
-        
+        self.q[self.index(state, action)] = (
+            old_q + self.alpha * (reward + future_rewards - old_q)
+        )
+
+    def moves(self, state):
+        """
+        Return the start of the row of the state `state` in `self.q`,
+        its available actions as a list, and the positions of their
+        Q-values in the row. Positions are a NumPy array for states with
+        at least VECTOR_ACTIONS actions, and a list otherwise. All three
+        are worked out, and the row of zeros added to the table, the
+        first time the state is seen.
+        """
+        row = self.row(state)
+        if row not in self.state_moves:
+            actions = sorted(Nim.available_actions(state))
+            columns = [self.offsets[i] + j - 1 for i, j in actions]
+            if np is not None and len(columns) >= VECTOR_ACTIONS:
+                columns = np.array(columns, dtype=np.intp)
+            start = len(self.q)
+            self.q.frombytes(bytes(8 * self.actions))
+            self.state_moves[row] = (start, actions, columns)
+        return self.state_moves[row]
+
+    def rewards(self, state):
+        """
+        Return the available actions in the state `state` and their
+        Q-values, as a NumPy array if the state has at least
+        VECTOR_ACTIONS actions and as a list otherwise.
+        """
+        start, actions, columns = self.moves(state)
+        if isinstance(columns, list):
+            return actions, [self.q[start + column] for column in columns]
+
+        # The view is a copy once indexed, so it does not keep
+        # `self.q` locked against growing
+        row = np.frombuffer(self.q, dtype=np.float64,
+                            count=self.actions, offset=8 * start)
+        return actions, row[columns]
+
     def best_future_reward(self, state):
         """
         Given a state `state`, consider all possible `(state, action)`
@@ -132,15 +227,13 @@ class NimAI():
         Q-value in `self.q`. If there are no available actions in
         `state`, return 0.
         """
-        actions = Nim.available_actions(state)
-        
+        actions, rewards = self.rewards(state)
         if len(actions) == 0:
             return 0
-        
-        rewards = [reward for reward in [self.q.get((tuple(state), a), 0) for a in actions]]
+        if isinstance(rewards, list):
+            return max(rewards)
+        return float(rewards.max())
 
-        return max(rewards)
-        
     def choose_action(self, state, epsilon=True):
         """
         Given a state `state`, return an action `(i, j)` to take.
@@ -156,30 +249,17 @@ class NimAI():
         If multiple actions have the same Q-value, any of those
         options is an acceptable return value.
         """
-        if epsilon == False:
-            epsilon = 0
+        actions, rewards = self.rewards(state)
+        if epsilon and random.random() < self.epsilon:
+            return random.choice(actions)
+
+        # Choose randomly among the actions with the highest Q-value
+        if isinstance(rewards, list):
+            best = max(rewards)
+            options = [k for k, reward in enumerate(rewards) if reward == best]
         else:
-            epsilon = self.epsilon
-
-        actions = Nim.available_actions(state)
-        prob = (1 - epsilon) / len(actions)
-        rewards = {action: {"reward": self.q.get((tuple(state), action), 0), "probability": prob} for action in actions}
-        max_reward = self.best_future_reward(state)
-        
-        counter = 0
-        for action in rewards:
-            if rewards[action]["reward"] == max_reward:
-                counter += 1
-        
-        for action in rewards:
-            if rewards[action]["reward"] == max_reward:
-                rewards[action]["probability"] = epsilon / counter
-            else:
-                rewards[action]["probability"] = (1 - epsilon) / (len(actions) - counter)
-
-        action = random.choices(list(rewards.keys()), [re["probability"] for re in rewards.values()])[0]
-
-        return action
+            options = np.flatnonzero(rewards == rewards.max())
+        return actions[options[random.randrange(len(options))]]
 
 
 def train(n):
@@ -237,9 +317,9 @@ def train(n):
 
     print("Done training")
     # print best moves for a state
-    # q = player.q
-    # l = {a: q[(s, a)] for (s, a),_ in sorted(q.items(), key=lambda elem: elem[1] ) if s == (1, 2, 1, 2)}
-    # print(l)
+    # s = [1, 2, 1, 2]
+    # l = {a: player.get_q_value(s, a) for a in Nim.available_actions(s)}
+    # print(sorted(l.items(), key=lambda elem: elem[1]))
 
     # Return the trained AI
     return player